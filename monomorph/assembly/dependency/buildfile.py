@@ -38,15 +38,24 @@ CLIENT_REQUIRED_DEPENDENCIES = []
 
 class BuildFile(ABC):
     """Abstract base class for build file manipulation."""
-    def __init__(self, path: str, java_version: str, output_path: Optional[str] = None, mode: str = "client"):
+    def __init__(self, path: Optional[str], java_version: str, output_path: Optional[str] = None, mode: str = "client",
+                 source_text: Optional[str] = None):
         self.path = path
         self.java_version = java_version
         self.output_path = output_path or path
+        # when the build file is given as text, it is handled in memory and save() sets output_text instead of writing
+        self.source_text = source_text
+        self.output_text: Optional[str] = None
         self.is_modified = False
         self._backup_path = None
         self.mode = mode
         self.logger = logging.getLogger("monomorph")
 
+    @property
+    def in_memory(self) -> bool:
+        """Whether the build file is read from and saved to memory instead of the disk."""
+        return self.source_text is not None
+
     def _get_java_version_as_int(self) -> int:
         """Converts the Java version string to an integer for comparison."""
         pattern = r"(1\.)?(\d+)"
@@ -1,4 +1,5 @@
 import logging
+from typing import Optional
 
 from .buildfile import BuildFile
 from .maven import MavenPomFile
@@ -6,9 +7,11 @@ from .gradle import GradleBuildFile
 
 
 class GrpcDependencyHandler:
-    def __init__(self, dependency_file: str, java_version: str, output_path: str,
-                 build_tool: str = "maven", backup: bool = False, mode: str = "client"):
+    def __init__(self, dependency_file: Optional[str], java_version: str, output_path: Optional[str],
+                 build_tool: str = "maven", backup: bool = False, mode: str = "client",
+                 source_text: Optional[str] = None):
         self.dependency_file = dependency_file
+        self.source_text = source_text
         self.java_version = java_version
         self.backup = backup
         self.output_path = output_path
@@ -18,12 +21,27 @@ class GrpcDependencyHandler:
         self.logger = logging.getLogger("monomorph")
         self.build_file = self._load_build_file()
 
+    @classmethod
+    def from_text(cls, text: str, java_version: str, build_tool: str = "maven",
+                  mode: str = "client") -> "GrpcDependencyHandler":
+        """Create a handler that updates the given build file content in memory (the result is in output_text)."""
+        return cls(None, java_version, output_path=None, build_tool=build_tool, mode=mode, source_text=text)
+
+    @property
+    def output_text(self) -> Optional[str]:
+        """The updated build file content when the handler works in memory (the source content if it was unchanged)."""
+        if self.build_file.output_text is None:
+            return self.source_text
+        return self.build_file.output_text
+
     def _load_build_file(self) -> BuildFile:
         """Load the appropriate BuildFile implementation based on build tool."""
         if self.build_tool == "maven":
-            return MavenPomFile(self.dependency_file, self.java_version, self.output_path, mode=self.mode)
+            return MavenPomFile(self.dependency_file, self.java_version, self.output_path, mode=self.mode,
+                                source_text=self.source_text)
         elif self.build_tool == "gradle":
-            return GradleBuildFile(self.dependency_file, self.java_version, self.output_path, mode=self.mode)
+            return GradleBuildFile(self.dependency_file, self.java_version, self.output_path, mode=self.mode,
+                                   source_text=self.source_text)
         else:
             raise ValueError(f"Unsupported build tool: {self.build_tool}")
 
@@ -31,7 +49,7 @@ class GrpcDependencyHandler:
         """Add required dependencies for gRPC."""
         if self._added_dependencies:
             return
-        self.logger.debug(f"Analyzing {self.build_file.path}...")
+        self.logger.debug(f"Analyzing {self.build_file.path or 'the in-memory build file'}...")
         self.build_file.parse()
         # --- Add Dependencies ---
         self.logger.debug("Adding gRPC dependencies...")
@@ -34,12 +34,16 @@ REQUIRED_GRADLE_PLUGINS_SERVER_DEPENDENCIES = [
 class GradleBuildFile(BuildFile):
     """Implementation of BuildFile for Gradle build.gradle files (Groovy)."""
 
-    def __init__(self, path: str, java_version: str, output_path: Optional[str] = None, mode: str = "client"):
-        super().__init__(path, java_version, output_path, mode)
+    def __init__(self, path: Optional[str], java_version: str, output_path: Optional[str] = None, mode: str = "client",
+                 source_text: Optional[str] = None):
+        super().__init__(path, java_version, output_path, mode, source_text)
         self._content: list[str] = []  # Store lines of the file
 
     def parse(self) -> None:
         """Loads the build.gradle file content."""
+        if self.in_memory:
+            self._content = self.source_text.splitlines(keepends=True)
+            return
         try:
             with open(self.path, 'r', encoding='utf-8') as f:
                 self._content = f.readlines()
@@ -59,6 +63,9 @@ class GradleBuildFile(BuildFile):
         if not self.is_modified:
             self.logger.debug("No changes detected. File not saved.")
             return
+        if self.in_memory:
+            self.output_text = "".join(self._content)
+            return
         if backup:
             self.create_backup()
         self.logger.info(f"Writing changes to {self.output_path}...")
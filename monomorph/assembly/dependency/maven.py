@@ -1,3 +1,4 @@
+import io
 import os
 import xml.etree.ElementTree as ET
 from typing import Any, Optional
@@ -67,8 +68,9 @@ class MavenPomFile(BuildFile):
     MAVEN_NAMESPACE = "http://maven.apache.org/POM/4.0.0"
     NS_MAP = {'mvn': MAVEN_NAMESPACE}  # For findall
 
-    def __init__(self, path: str, java_version: str, output_path: Optional[str] = None, mode: str = "client"):
-        super().__init__(path, java_version, output_path, mode)
+    def __init__(self, path: Optional[str], java_version: str, output_path: Optional[str] = None, mode: str = "client",
+                 source_text: Optional[str] = None):
+        super().__init__(path, java_version, output_path, mode, source_text)
         self.tree: Optional[ET.ElementTree] = None
         self.root: Optional[ET.Element] = None
         self._namespace = ""  # Determined during parse
@@ -212,7 +214,10 @@ class MavenPomFile(BuildFile):
             # Register namespace for cleaner output, still need ns in findall etc.
             ET.register_namespace('', self.MAVEN_NAMESPACE)
             parser = ET.XMLParser(encoding="utf-8", target=ET.TreeBuilder(insert_comments=True))
-            self.tree = ET.parse(self.path, parser)
+            if self.in_memory:
+                self.tree = ET.ElementTree(ET.fromstring(self.source_text, parser))
+            else:
+                self.tree = ET.parse(self.path, parser)
             self.root = self.tree.getroot()
 
             # Determine namespace from root element
@@ -240,6 +245,15 @@ class MavenPomFile(BuildFile):
             self.logger.error(f"File not found at {self.path}")
             raise
 
+    def _serialize(self) -> str:
+        """Serializes the POM tree (pretty printed and with the XML declaration) to text."""
+        # Use ET.indent for pretty printing (Python 3.9+)
+        if hasattr(ET, 'indent'):
+            ET.indent(self.tree, space="  ", level=0)
+        buffer = io.BytesIO()
+        self.tree.write(buffer, encoding="utf-8", xml_declaration=True)
+        return buffer.getvalue().decode("utf-8")
+
     def save(self, backup: bool = False) -> None:
         """Saves the modified POM file."""
         if self.tree is None or self.root is None:
@@ -248,15 +262,17 @@ class MavenPomFile(BuildFile):
         if not self.is_modified:
             self.logger.debug("No changes detected. File not saved.")
             return
+        if self.in_memory:
+            self.output_text = self._serialize()
+            return
         if backup:
             self.create_backup()
         self.logger.info(f"Writing dependency changes to {self.output_path}...")
         try:
-            # Use ET.indent for pretty printing (Python 3.9+)
-            if hasattr(ET, 'indent'):
-                ET.indent(self.tree, space="  ", level=0)
+            text = self._serialize()
             os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
-            self.tree.write(self.output_path, encoding="utf-8", xml_declaration=True)
+            with open(self.output_path, 'w', encoding='utf-8', newline='') as f:
+                f.write(text)
             self.logger.info("Save complete.")
         except Exception as e:
             self.logger.error(f"Error writing file {self.output_path}: {e}")
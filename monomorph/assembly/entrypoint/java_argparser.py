@@ -2,6 +2,20 @@ import shlex
 import re
 
 
+# Patterns compiled once at import (they are matched against every token of the parsed commands)
+_JAVA_EXECUTABLE_PATTERN = re.compile(r'(?:^|[/\\:])java(?:.exe)?$')
+_CLASS_NAME_PATTERN = re.compile(r"^[a-zA-Z_$][\w$.]*$")
+_EXEC_FORM_PATTERN = re.compile(r'(ENTRYPOINT|CMD)\s+\[(.*?)\]')
+_SHELL_FORM_PATTERN = re.compile(r'(ENTRYPOINT|CMD)\s+([^[].+?)(?=\s*(?:ENTRYPOINT|CMD|$))')
+# Characters that need shlex to split a command line (quotes and escapes)
+_SHELL_QUOTING_CHARS = frozenset("'\"\\")
+# Options classified with a single set lookup per token
+_MODULE_OPTIONS = frozenset({"-m", "--module"})
+_MAIN_CLASS_OPTIONS = frozenset({"-e", "--main-class"})
+_OPTIONS_WITH_ARGUMENT = frozenset({"-cp", "-classpath", "--class-path", "-p", "--module-path", "--upgrade-module-path",
+                                    "--patch-module", "-d", "--source"})
+
+
 def find_java_main_class(command_line: str | list[str]) -> str | None:
     """
     Parses a Java command line string or list to find the main class.
@@ -26,50 +40,83 @@ def find_java_main_class(command_line: str | list[str]) -> str | None:
         (e.g., relying on JAR manifest without -e/--main-class).
     """
     if isinstance(command_line, str):
-        try:
-            args = shlex.split(command_line, posix=True)
-        except ValueError as e:
-            print(f"Warning: Could not parse command line: {e}")
-            return None
+        if not _SHELL_QUOTING_CHARS.intersection(command_line):
+            # Without quotes or escapes, shlex only splits on whitespace
+            args = command_line.split()
+        else:
+            try:
+                args = shlex.split(command_line, posix=True)
+            except ValueError as e:
+                print(f"Warning: Could not parse command line: {e}")
+                return None
     elif isinstance(command_line, list):
         args = command_line
     else:
         raise TypeError("command_line must be a string or a list of strings")
 
-    if not args:
+    # At least the 'java' executable and one argument are needed to specify a main class
+    if len(args) < 2:
         return None
 
-    # Find the 'java' executable
+    # Find the 'java' executable (the pattern also matches an exact 'java' token)
     java_index = -1
     for i, arg in enumerate(args):
-        if re.search(r'(?:^|[/\\:])java(?:.exe)?$', arg):
+        if _JAVA_EXECUTABLE_PATTERN.search(arg):
             java_index = i
             break
     if java_index == -1:
-        try: # Fallback for exact 'java' match if path search failed
-            java_index = args.index('java')
-        except ValueError:
-            return None # 'java' command not found
+        return None # 'java' command not found
 
     # --- State variables during parsing ---
     main_class_found = None
     in_jar_mode = False
     # Priority: -m/--module > -e/--main-class > positional/source-file
 
+    # The arguments are never modified, so their count is only computed once
+    n_args = len(args)
     i = java_index + 1
-    while i < len(args):
+    while i < n_args:
         arg = args[i]
 
-        # --- Check for specific syntaxes first ---
+        # --- Dispatch on the first character: a token that is not an option can only be a positional main class
+        # or source file (lowest priority), so it skips all the option checks ---
+        if not arg.startswith(("-", "@")):
+            # Only consider this if we are NOT in jar mode AND haven't already found a class via -e/--main-class
+            if not in_jar_mode and main_class_found is None:
+                potential_main = arg
+                # A valid source file name (Name.java) is also a valid class name and the pattern rejects paths
+                # ('/' and '\\'), so a single match covers both cases
+                if _CLASS_NAME_PATTERN.match(potential_main):
+                    main_class_found = potential_main
+                    # Found the positional class/source, assume subsequent non-options are args to it
+                    # We can stop searching for *this type* of main class.
+                    # We still need `break` or similar if we are *certain* no `-e` etc can follow,
+                    # but it's safer to let the loop finish to catch all options.
+                    # So, just store it and let loop continue. If -e appears later, it will overwrite.
+                    i += 1 # Move to the next token (likely program args)
+                    continue # Continue parsing (maybe other Java options follow args)
+                else:
+                    # This token is likely an argument to the main class/source file
+                    # or an argument to an unknown option. Stop searching for a positional class.
+                    # We can just break or return the current main_class_found (which might be None).
+                    # Let's break to treat remaining tokens as program args.
+                    break # Treat rest as program arguments
+            else:
+                # We are in JAR mode (expecting -e or nothing) OR
+                # we already found a class via -e/--main-class OR
+                # this token doesn't look like a class/source file.
+                # Treat it and subsequent tokens as program arguments.
+                break # Treat rest as program arguments
+
+        # --- Options: check for specific syntaxes first ---
         # 1. Module specification with main class (highest priority)
-        if arg in ("-m", "--module"):
-            if i + 1 < len(args):
-                module_arg = args[i+1]
-                if "/" in module_arg:
-                    parts = module_arg.split("/", 1)
-                    if len(parts) == 2 and parts[0] and parts[1]:
-                        potential_class = parts[1]
-                        if re.match(r"^[a-zA-Z_$][\w$.]*$", potential_class):
+        elif arg in _MODULE_OPTIONS:
+            if i + 1 < n_args:
+                # Split 'module/mainclass' in a single scan
+                module_name, separator, potential_class = args[i+1].partition("/")
+                if separator:
+                    if module_name and potential_class:
+                        if _CLASS_NAME_PATTERN.match(potential_class):
                             return potential_class # Found module/class, return immediately
                         else:
                             return None # Invalid class name format in module
@@ -85,18 +132,18 @@ def find_java_main_class(command_line: str | list[str]) -> str | None:
         elif arg == "-jar":
             in_jar_mode = True
             i += 1 # Skip '-jar'
-            if i < len(args):
+            if i < n_args:
                 i += 1 # Skip the jarfile argument
             else:
                  return None # Malformed, -jar needs argument
             continue # Continue parsing for other options like -e
 
         # 3. Main class override for JARs (second priority)
-        elif arg in ("-e", "--main-class"):
-            if i + 1 < len(args):
+        elif arg in _MAIN_CLASS_OPTIONS:
+            if i + 1 < n_args:
                 potential_class = args[i+1]
                 # Basic validation for the class name argument
-                if re.match(r"^[a-zA-Z_$][\w$.]*$", potential_class) and "/" not in potential_class and "\\" not in potential_class:
+                if _CLASS_NAME_PATTERN.match(potential_class) and "/" not in potential_class and "\\" not in potential_class:
                     main_class_found = potential_class # Store the override class
                     i += 2 # Skip option and its argument
                     continue # Continue parsing for other options
@@ -108,48 +155,18 @@ def find_java_main_class(command_line: str | list[str]) -> str | None:
                 return None
 
         # --- Handle options (skip them and their potential arguments) ---
-        elif arg in ("-cp", "-classpath", "--class-path", "-p", "--module-path", "--upgrade-module-path", "--patch-module", "-d", "--source"):
+        elif arg in _OPTIONS_WITH_ARGUMENT:
              i += 1 # Skip the option
              # Skip the argument only if it exists and doesn't look like another option
-             if i < len(args) and not args[i].startswith("-"):
+             if i < n_args and not args[i].startswith("-"):
                  i += 1
              continue
 
-        elif arg.startswith("-") or arg.startswith("@"):
+        else:
             # Skip other options (-X, -D, --add-opens, @file etc.)
             i += 1
             continue
 
-        # --- Found a potential positional main class or source file (lowest priority) ---
-        else:
-            # Only consider this if we are NOT in jar mode AND haven't already found a class via -e/--main-class
-            if not in_jar_mode and main_class_found is None:
-                potential_main = arg
-                is_valid_class = re.match(r"^[a-zA-Z_$][\w$.]*$", potential_main) and "/" not in potential_main and "\\" not in potential_main
-                is_valid_source = potential_main.endswith(".java") and "/" not in potential_main and "\\" not in potential_main and re.match(r"^[a-zA-Z_$][\w$]*$", potential_main[:-5])
-
-                if is_valid_class or is_valid_source:
-                    main_class_found = potential_main
-                    # Found the positional class/source, assume subsequent non-options are args to it
-                    # We can stop searching for *this type* of main class.
-                    # We still need `break` or similar if we are *certain* no `-e` etc can follow,
-                    # but it's safer to let the loop finish to catch all options.
-                    # So, just store it and let loop continue. If -e appears later, it will overwrite.
-                    i += 1 # Move to the next token (likely program args)
-                    continue # Continue parsing (maybe other Java options follow args)
-                else:
-                    # This token is likely an argument to the main class/source file
-                    # or an argument to an unknown option. Stop searching for a positional class.
-                    # We can just break or return the current main_class_found (which might be None).
-                    # Let's break to treat remaining tokens as program args.
-                    break # Treat rest as program arguments
-            else:
-                # We are in JAR mode (expecting -e or nothing) OR
-                # we already found a class via -e/--main-class OR
-                # this token doesn't look like a class/source file.
-                # Treat it and subsequent tokens as program arguments.
-                break # Treat rest as program arguments
-
     # Loop finished or broke early
     return main_class_found
 
@@ -172,12 +189,10 @@ def extract_docker_command(dockerfile_line: str) -> str:
         str: The formatted command as it would be executed
     """
     # Find all exec-form commands (with square brackets)
-    exec_pattern = r'(ENTRYPOINT|CMD)\s+\[(.*?)\]'
-    exec_matches = re.findall(exec_pattern, dockerfile_line)
+    exec_matches = _EXEC_FORM_PATTERN.findall(dockerfile_line)
 
     # Find all shell-form commands
-    shell_pattern = r'(ENTRYPOINT|CMD)\s+([^[].+?)(?=\s*(?:ENTRYPOINT|CMD|$))'
-    shell_matches = re.findall(shell_pattern, dockerfile_line)
+    shell_matches = _SHELL_FORM_PATTERN.findall(dockerfile_line)
 
     entrypoint = None
     cmd = None
@@ -26,6 +26,12 @@ class GrpcRefactorClient(CliImportParserClient):
     """
     DEFAULT_SERVER_HOST = "localhost"
     DEFAULT_SERVER_PORT = 50051
+    # Keep the (long-lived) channel's connection alive between calls. The keepalive time should not be lower than
+    # the grpc-java server's default minimum ping interval (5 minutes) otherwise the server closes the connection
+    CHANNEL_OPTIONS = [
+        ("grpc.keepalive_time_ms", 300_000),
+        ("grpc.keepalive_timeout_ms", 20_000),
+    ]
 
     def __init__(
         self,
@@ -131,7 +137,7 @@ class GrpcRefactorClient(CliImportParserClient):
 
             self.logger.info(f"Connecting gRPC client to {self.server_address}...")
             # Use insecure channel for local testing, use secure channel for production
-            self.channel = grpc.insecure_channel(self.server_address)
+            self.channel = grpc.insecure_channel(self.server_address, options=self.CHANNEL_OPTIONS)
             # readiness check:
             if not self.wait_for_server():
                 raise RuntimeError(f"Timeout ({self.startup_timeout}s) waiting for gRPC server to be "
@@ -1,6 +1,8 @@
 import importlib.resources
 import json
 import logging
+import threading
+from collections import OrderedDict
 from typing import Optional, Callable, Type
 
 from langchain_openai.chat_models.base import BaseChatOpenAI
@@ -14,6 +16,12 @@ from .tracking.usage import CallbackContext
 with importlib.resources.open_text('monomorph.resources', f'model_map.json') as f:
     MODEL_MAP = json.load(f)
 
+# Models shared between workflows, keyed by their configuration (see init_shared_model). The least recently used
+# models are evicted once there are more than _MAX_SHARED_MODELS of them
+_SHARED_MODELS: OrderedDict[tuple, Optional[BaseChatOpenAI]] = OrderedDict()
+_SHARED_MODELS_LOCK = threading.Lock()
+_MAX_SHARED_MODELS = 32
+
 
 def get_model(name: str, block_paid_api: bool = True) -> str:
     logger = logging.getLogger("monomorph")
@@ -57,6 +65,31 @@ def init_model(model_name: Optional[str], mode: str = "tooling", tools: Optional
         return None
 
 
+def init_shared_model(model_name: Optional[str], mode: str = "tooling", tools: Optional[list[Callable]] = None,
+                      output_type: Optional[Type[BaseModel]] = None,
+                      block_paid_api: bool = False) -> Optional[BaseChatOpenAI]:
+    """
+    Initializes the model like init_model but reuses the instance (and its HTTP client) created for a previous call
+    with the same configuration. Tools are identified by their name and description since only their schemas are
+    bound to the model. The shared model has no callbacks, these must be attached per call with `with_config`.
+    """
+    tools_key = None
+    if tools is not None:
+        tools_key = tuple(sorted((getattr(t, "name", getattr(t, "__name__", repr(t))),
+                                  getattr(t, "description", getattr(t, "__doc__", None)) or "") for t in tools))
+    key = (model_name, mode, tools_key, output_type, block_paid_api)
+    # The lookup and the creation are done under the lock so that concurrent workflows do not create duplicate models
+    with _SHARED_MODELS_LOCK:
+        if key in _SHARED_MODELS:
+            _SHARED_MODELS.move_to_end(key)
+        else:
+            _SHARED_MODELS[key] = init_model(model_name, mode=mode, tools=tools, output_type=output_type,
+                                             block_paid_api=block_paid_api)
+            if len(_SHARED_MODELS) > _MAX_SHARED_MODELS:
+                _SHARED_MODELS.popitem(last=False)
+        return _SHARED_MODELS[key]
+
+
 def get_chat_class(model_name: str, block_paid_api: bool = False) -> tuple[Type[BaseChatOpenAI], str, dict]:
     """
     Returns the appropriate chat class based on the model name and the model name without the prefix.
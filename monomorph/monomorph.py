@@ -11,6 +11,8 @@ from concurrent.futures.thread import ThreadPoolExecutor
 from typing import Optional
 import uuid
 
+import docker
+
 from .logging.printer import ConsolePrinter
 from .llm.tracking.checkpoints import CheckpointStorage
 from .llm.tracking.usage import CallbackContext, GlobalUsageTracker
@@ -593,11 +595,13 @@ class MonoMorph:
         ## Create the corrected microservices directory to temporarily store the corrected microservices
         corrected_microservices_dir = os.path.join(self.project.project_path, "corrected_microservices")
         os.makedirs(corrected_microservices_dir, exist_ok=True)
+        # A single Docker client is shared by all the microservices
+        docker_client = MicroserviceDocker.create_client()
         # Validate each microservice
         for ms_name, microservice in self.project.microservices.items():
             # self.logger.debug(f"Validating microservice {ms_name}")
             tar_file = os.path.join(corrected_microservices_dir, microservice.uid, "docker_copy.tar")
-            success = self.validate_microservice(microservice, tar_file)
+            success = self.validate_microservice(microservice, tar_file, docker_client)
             if success:
                 self.logger.info(f"Microservice {microservice.name} compiled successfully.")
             self.replace_refactored_with_corrected(microservice, tar_file)
@@ -639,12 +643,13 @@ class MonoMorph:
         else:
             self.logger.warning(f"Tar file {tar_file} does not exist. Keeping the original microservice files ")
 
-    def validate_microservice(self, microservice: MicroserviceDirectory, tar_file: str) -> bool:
+    def validate_microservice(self, microservice: MicroserviceDirectory, tar_file: str,
+                              docker_client: Optional[docker.DockerClient] = None) -> bool:
         self.logger.debug(f"Validating microservice {microservice.name}")
         # Create the microservice's docker handler
         ms_docker = MicroserviceDocker(self.app_name, microservice, self.original_dockerfile_path,
                                        build_system=self.build_tool, persistent_container=True,
-                                       resume_from=self.resume_from)
+                                       resume_from=self.resume_from, docker_client=docker_client)
         try:
             # Compile the microservice
             compilation_handler = CompilationRunner(ms_docker, self.build_tool, False, False)
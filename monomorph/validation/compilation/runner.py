@@ -53,17 +53,16 @@ class CompilationRunner:
             A tuple containing (success: bool, logs: str).
         """
         try:
+            if with_tests:
+                # Use test compilation commands
+                commands = TEST_COMPILE_COMMAND_MAP[self.build_system]
+            else:
+                commands = COMPILE_COMMAND_MAP[self.build_system]
+            command = commands[debug_mode]
             if self.ms_docker.persistent_container:
                 # Use persistent container approach
                 self.ms_docker.start_container()
 
-                if with_tests:
-                    # Use test compilation commands
-                    commands = TEST_COMPILE_COMMAND_MAP[self.build_system]
-                else:
-                    commands = COMPILE_COMMAND_MAP[self.build_system]
-                command = commands[debug_mode]
-
                 exit_code, logs = self.ms_docker.execute_command(command)
                 success = exit_code == 0
 
@@ -78,7 +77,7 @@ class CompilationRunner:
                 return success, logs
             else:
                 # Use one-time container approach
-                return self._compile_project_oneshot()
+                return self._compile_project_oneshot(command)
         except docker.errors.BuildError as e:
             build_log = "\n".join([item['stream'] for item in e.build_log if 'stream' in item])
             err_msg = f"Docker image build failed.\nBuild Log:\n{build_log}"
@@ -103,32 +102,37 @@ class CompilationRunner:
             if self.auto_cleanup_container:
                 self.ms_docker.cleanup(self.auto_cleanup_image)
 
-    def _compile_project_oneshot(self) -> tuple[bool, str]:
+    def _compile_project_oneshot(self, command: str) -> tuple[bool, str]:
         """
-        Orchestrates the entire compilation process using docker-py.
+        Compiles the project in a one-time container of the validation image, which runs the compilation command.
+
+        Args:
+            command: The compilation command to run.
 
         Returns:
             A tuple containing (success: bool, logs: str).
         """
         # 1. Build the Docker image
-        command_string = ', '.join([f'"{c}"' for c in COMPILE_COMMAND_MAP[self.build_system].split()])
+        command_string = ', '.join([f'"{c}"' for c in command.split()])
         entrypoint_script = f"CMD [ {command_string} ]"
         image_tag = self.ms_docker.build_image(entrypoint_script)
         # 2. Run the container to perform compilation
         self.logger.info(f"Running compilation in container from image '{image_tag}'...")
         container = self.ms_docker.run_container()
-        # Wait for completion and get logs
-        result = container.wait()
-        exit_code = result['StatusCode']
-        logs = container.logs(stdout=True, stderr=True, stream=False)
-        container.remove()
+        try:
+            # Wait for completion and get logs
+            result = container.wait(timeout=self.ms_docker.timeout_seconds)
+            exit_code = result['StatusCode']
+            logs = container.logs(stdout=True, stderr=True, stream=False).decode('utf-8')
+        finally:
+            container.remove(force=True)
         if exit_code == 0:
             self.logger.info("Compilation successful.")
-            return True, logs.decode('utf-8').strip()
+            return True, logs.strip()
         else:
             err_msg = (
                 f"Compilation failed with exit code {exit_code}.\n"
-                f"Container Logs:\n{logs.decode('utf-8')}"
+                f"Container Logs:\n{logs}"
             )
             return False, err_msg
 
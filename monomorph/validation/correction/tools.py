@@ -24,7 +24,7 @@ class ErrorCorrectionTools:
     """Implementations for the tools for error correction."""
 
     def __init__(self, ms_docker: MicroserviceDocker, compilation_handler: CompilationRunner,
-                 generated_classes: dict[str, Path], relevant_classes: dict[str, Path],
+                 generated_classes: dict[str, str], relevant_classes: dict[str, Path],
                  refactoring_details: dict[str, tuple[str, str]], language: str = "java",
                  with_tests: bool = False):
         """
@@ -1,10 +1,11 @@
 import os
+import re
 import shlex
 import uuid
 import logging
 import tempfile
 from pathlib import Path
-from typing import Optional, Literal
+from typing import Optional, Literal, Iterable
 
 import docker
 import dotenv
@@ -21,6 +22,8 @@ class MicroserviceDocker:
     A class representing an instance of a refactoring microservice deployed in a Docker container.
     """
     PREVIEW_LENGTH = 100
+    # The first 'FROM' instruction of a Dockerfile
+    FROM_REGEX = re.compile(r"^[ \t]*FROM[ \t]+.+$", re.MULTILINE | re.IGNORECASE)
 
     def __init__(
             self,
@@ -30,7 +33,8 @@ class MicroserviceDocker:
             build_system: Literal["gradle", "maven"] = "maven",
             timeout_seconds: Optional[int] = 300,
             persistent_container: bool = False,
-            resume_from: Optional[str] = None
+            resume_from: Optional[str] = None,
+            docker_client: Optional[docker.DockerClient] = None
     ):
         """
         Initializes the MicroserviceDocker.
@@ -43,6 +47,8 @@ class MicroserviceDocker:
             timeout_seconds: Timeout for the container run process in seconds.
             persistent_container: Whether to keep the container running for multiple operations.
             resume_from: Optional path to resume from a previous state.
+            docker_client: Optional Docker client to reuse (e.g. shared across microservices). A new client is created
+                if not provided.
 
         Raises:
             ValueError: If inputs are invalid (e.g., paths don't exist, invalid build_system).
@@ -70,16 +76,27 @@ class MicroserviceDocker:
         self.container_name = f"{self.app_name}-{self.microservice.name}-container-{self.validation_id}"
         self.dockerfile_content: Optional[str] = None
         self.base_image: Optional[str] = None
+        self._original_dockerfile_text: Optional[str] = None
         self.logger = logging.getLogger("monomorph")
         # Initialize the Docker client
+        self.client = docker_client if docker_client is not None else self.create_client()
+        # Validate inputs and prerequisites
+        self._validate_inputs()
+
+    @classmethod
+    def create_client(cls) -> docker.DockerClient:
+        """
+        Creates a Docker client connected to the configured Docker socket.
+
+        Raises:
+            RuntimeError: If the Docker client could not be initialized.
+        """
         try:
             dotenv.load_dotenv()
             CUSTOM_DOCKER_SOCKET = os.getenv("CUSTOM_DOCKER_SOCKET")
-            self.client = docker.DockerClient(base_url=CUSTOM_DOCKER_SOCKET)
+            return docker.DockerClient(base_url=CUSTOM_DOCKER_SOCKET)
         except DockerException as e:
             raise RuntimeError(f"Could not initialize Docker client. Is Docker installed and configured? Error: {e}")
-        # Validate inputs and prerequisites
-        self._validate_inputs()
 
     @classmethod
     def validate_prerequisites(cls):
@@ -160,14 +177,17 @@ class MicroserviceDocker:
             self.base_image = default_image
             return f"FROM {default_image}"
         self.logger.debug(f"Extracting base image from {self.original_dockerfile_path}...")
-        with open(self.original_dockerfile_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                stripped_line = line.strip()
-                if stripped_line.upper().startswith("FROM "):
-                    self.logger.info(f"Found base image instruction: '{stripped_line}'")
-                    self.base_image = stripped_line.split()[1]  # Get the image name after 'FROM'
-                    return stripped_line
-        raise ValueError(f"Could not find a 'FROM' instruction in {self.original_dockerfile_path}")
+        if self._original_dockerfile_text is None:
+            # The original Dockerfile is only read once
+            with open(self.original_dockerfile_path, 'r', encoding='utf-8') as f:
+                self._original_dockerfile_text = f.read()
+        from_match = self.FROM_REGEX.search(self._original_dockerfile_text)
+        if from_match is None:
+            raise ValueError(f"Could not find a 'FROM' instruction in {self.original_dockerfile_path}")
+        stripped_line = from_match.group(0).strip()
+        self.logger.info(f"Found base image instruction: '{stripped_line}'")
+        self.base_image = stripped_line.split()[1]  # Get the image name after 'FROM'
+        return stripped_line
 
     def _create_validation_dockerfile(self, base_image_line: str, dockerfile_path: Optional[str] = None,
                                       entrypoint_script: Optional[str] = None) -> Path:
@@ -430,18 +450,32 @@ class MicroserviceDocker:
         exit_code, output = self.execute_command(f"rm -f {file_path}")
         return exit_code == 0, output if exit_code != 0 else None
 
-    def list_files(self, directory: str = ".") -> tuple[bool, list[str], Optional[str]]:
+    def list_files(self, directory: str = ".", prune_dirs: Optional[Iterable[str]] = None,
+                   exclude_names: Optional[Iterable[str]] = None,
+                   include_hidden: bool = True) -> tuple[bool, list[str], Optional[str]]:
         """
-        Lists files recursively in a directory in the container.
+        Lists files recursively in a directory in the container. The filters are applied by `find` inside the
+        container so that the excluded paths are never sent back.
 
         Args:
             directory: Directory path in the container.
+            prune_dirs: Optional names of directories whose content is skipped.
+            exclude_names: Optional file name patterns (as understood by `find -name`) to exclude.
+            include_hidden: Whether to include hidden files (starting with .) in the results.
 
         Returns:
             Tuple of (success: bool, error: Optional[str], files: Optional[list[str]]).
         """
+        prune_dirs = sorted(prune_dirs or [])
+        prune_expr = ""
+        if prune_dirs:
+            names = " -o ".join(f"-name {shlex.quote(name)}" for name in prune_dirs)
+            prune_expr = f"-type d \\( {names} \\) -prune -o "
+        file_filters = [] if include_hidden else ["-not -name '.*'"]
+        file_filters.extend(f"-not -name {shlex.quote(pattern)}" for pattern in exclude_names or [])
+        file_expr = " ".join(["-type f"] + file_filters)
         # Return absolute path for the found files
-        exit_code, output = self.execute_command(f'find "$(realpath "{directory}")" -type f')
+        exit_code, output = self.execute_command(f'find "$(realpath "{directory}")" {prune_expr}{file_expr} -print')
         if exit_code == 0:
             files = output.splitlines() if output else []
             return True, files, None
@@ -1,5 +1,6 @@
 from typing import Literal, Callable, Optional
 
+from pydantic import ValidationError
 from langchain_core.messages import AIMessage, SystemMessage, HumanMessage
 from langchain_openai.chat_models.base import BaseChatOpenAI
 from langgraph.graph import MessagesState
@@ -19,6 +20,28 @@ class AgentState(MessagesState):
     parsing_attempts: int
 
 
+def repair_parsed_output(raw_message) -> Optional[CompilationAnalysisReport]:
+    """
+    Attempts to recover the analysis report from the raw response of a failed structured output call (e.g. JSON
+    wrapped in a markdown code block or surrounded by text) without invoking the parser model again.
+
+    :param raw_message: The raw message returned alongside the failed parsing result.
+    :return: The validated report or None if it could not be recovered.
+    """
+    if not isinstance(raw_message, AIMessage):
+        return None
+    try:
+        if raw_message.tool_calls:
+            return CompilationAnalysisReport.model_validate(raw_message.tool_calls[0]["args"])
+        content = raw_message.content if isinstance(raw_message.content, str) else ""
+        start, end = content.find("{"), content.rfind("}")
+        if start == -1 or end < start:
+            return None
+        return CompilationAnalysisReport.model_validate_json(content[start:end + 1])
+    except ValidationError:
+        return None
+
+
 def define_compilation_analysis_nodes(analysis_model: BaseChatOpenAI, parser_model: Optional[BaseChatOpenAI] = None,
                                       parser_system_prompt: str = "",
                                       callback_handler: Optional[ValidationCallBackHandler] = None,
@@ -33,7 +56,7 @@ def define_compilation_analysis_nodes(analysis_model: BaseChatOpenAI, parser_mod
     :param stream: If True, the model will stream responses instead of returning them all at once.
     :return: The list of functions to be used in the workflow.
     """
-    MAX_PARSING_RETRIES = 3
+    MAX_PARSING_RETRIES = 2
     # If no parser model is provided, use the decision model
     if parser_model is None:
         parser_model = analysis_model
@@ -77,10 +100,14 @@ def define_compilation_analysis_nodes(analysis_model: BaseChatOpenAI, parser_mod
                 # logger.print("--- Decision: Parsing Succeeded -> End", "node", highlight=True)
                 logger.debug(f"Parsing successful, Ending workflow", msg_type="node", highlight=True)
                 return "__end__"  # Success! End the graph.
-            else:
+            elif state.get("parsing_attempts", 0) < MAX_PARSING_RETRIES:
                 # logger.print("--- Decision: Parsing Failed -> Retry", "node", highlight=True)
                 logger.debug(f"Parsing failed, retrying...", msg_type="node", highlight=True)
                 return "retry_parsing"
+            else:
+                logger.debug(f"Parsing failed and max retries reached, Ending workflow", msg_type="node",
+                             highlight=True)
+                return "__end__"
         elif "parsing_attempts" not in state or state["parsing_attempts"] < MAX_PARSING_RETRIES:
             # logger.print("--- Decision: Parsing Failed, Retrying -> final_parser", "node", highlight=True)
             logger.debug(f"Parsing failed, retrying...", msg_type="node", highlight=True)
@@ -139,6 +166,12 @@ def define_compilation_analysis_nodes(analysis_model: BaseChatOpenAI, parser_mod
                 output = parser_model.invoke(parser_input_messages)
             if isinstance(output, dict) and "parsed" in output:
                 parsed_output: CompilationAnalysisReport = output["parsed"]
+                if parsed_output is None:
+                    # Try to recover the report from the raw response before spending another parser call
+                    parsed_output = repair_parsed_output(output.get("raw"))
+                    if parsed_output is not None:
+                        logger.debug(f"Recovered the analysis report from the raw parser response",
+                                     msg_type="node", highlight=True)
             else:
                 logger.error(f"Missing 'parsed' key in response. Using initial output",
                              msg_type="node", highlight=True)
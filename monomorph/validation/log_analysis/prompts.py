@@ -11,6 +11,13 @@ class CompilationLogAnalysisPrompt(Jinja2Prompt):
     """
     BASENAME = "compilation_correcting"
     VERSION = "0.0.2"
+    OUTPUT_TYPE_NAME = CompilationAnalysisReport.__name__
+    USER_PROMPT_TEMPLATE = """
+        # Compilation Logs
+```text
+{compilation_logs}
+```
+        """
 
     def __init__(self, logs: str, package_name: str, current_microservice: str = "ms1", language: str = "java",
                  **kwargs):
@@ -19,13 +26,7 @@ class CompilationLogAnalysisPrompt(Jinja2Prompt):
         self.language = LANGUAGE_MAP[language]
         self.current_microservice = current_microservice
         self.package_name = package_name
-        self.output_type_name: str = CompilationAnalysisReport.__class__.__name__
-        self.USER_PROMPT_TEMPLATE = """
-        # Compilation Logs
-```text
-{compilation_logs}
-```
-        """
+        self.output_type_name: str = self.OUTPUT_TYPE_NAME
 
     def generate_prompt(self) -> str:
         return self.USER_PROMPT_TEMPLATE.format(compilation_logs=self.logs)
@@ -1,3 +1,4 @@
+import os
 from typing import Optional, List
 from pathlib import Path
 
@@ -21,7 +22,7 @@ COMMON_SUFFIX_LANG_MAPPINGS = {
 class CompilationLogAnalysisTools:
     """Implementations for the tools for analyzing compilation logs."""
 
-    def __init__(self, app_model: AppModel, ms_root: str, generated_classes: dict[str, Path], generated_files: list[str],
+    def __init__(self, app_model: AppModel, ms_root: str, generated_classes: dict[str, str], generated_files: list[str],
                  log_details: dict[str, int | str], language: str = "java",
                  relevant_classes: Optional[List[str]] = None):
         self.app_model = app_model
@@ -44,7 +45,7 @@ class CompilationLogAnalysisTools:
         if class_name in self.generated_classes:
             # If the class is generated, return the source code directly.
             file_path = self.generated_classes[class_name]
-            assert file_path.exists(), f"File {file_path} does not exist"
+            assert os.path.exists(file_path), f"File {file_path} does not exist"
             with open(file_path, 'r', encoding='utf-8') as file:
                 content = file.read()
             return f"The source code of the class `{class_name}` is:\n" + \
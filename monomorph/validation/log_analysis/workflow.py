@@ -19,12 +19,16 @@ from ...helpers import HelperManager
 from ...microservice import MicroserviceDirectory
 from ...generation.prompts import PARSING_SYSTEM_PROMPT_TEMPLATE
 from ...llm.tracking.usage import CallbackContext, UsageCallbackHandler
-from ...llm.factory import init_model
+from ...llm.factory import init_shared_model
 from ...analysis.model import AppModel
 from ...logging.printer import ConsolePrinter
 from ...logging.utils import log_inputs, log_outputs, create_conversation_log
 
 
+# The parsing prompt does not depend on the workflow's inputs
+PARSING_SYSTEM_PROMPT = PARSING_SYSTEM_PROMPT_TEMPLATE.format(type_name=CompilationAnalysisReport.__name__)
+
+
 class CompilationAnalysisWorkflow:
     PREVIEW_LENGTH = 100
 
@@ -54,19 +58,27 @@ class CompilationAnalysisWorkflow:
                                                          relevant_classes=relevant_classes)
         self.tools = self.tools_manager.get_tools()
         self.logger.debug(f"Using {decision_model} as a compilation analysis model", msg_type="workflow", highlight=True)
-        self.decision_model = init_model(decision_model, mode="tooling", tools=self.tools,
-                                         block_paid_api=block_paid_api)
+        self.decision_model = init_shared_model(decision_model, mode="tooling", tools=self.tools,
+                                                block_paid_api=block_paid_api)
         parsing_model = parsing_model or decision_model
         self.logger.debug(f"Using {parsing_model} as a parsing model", msg_type="workflow", highlight=True)
-        self.parsing_model = init_model(parsing_model, mode="structured", output_type=CompilationAnalysisReport,
-                                        block_paid_api=block_paid_api)
-        parsing_system_prompt = PARSING_SYSTEM_PROMPT_TEMPLATE.format(
-            type_name=CompilationAnalysisReport.__class__.__name__)
+        self.parsing_model = init_shared_model(parsing_model, mode="structured",
+                                               output_type=CompilationAnalysisReport, block_paid_api=block_paid_api)
+        self.parsing_system_prompt = PARSING_SYSTEM_PROMPT
         self.callback_context = callback_context
         self.callback_handler = ValidationCallBackHandler()
-        self.graph = self.create_compilation_analysis_graph(self.tools, self.decision_model, self.parsing_model,
-                                                            parsing_system_prompt, should_stream,
-                                                            callback_handler=self.callback_handler)
+        self._graph: Optional[CompiledStateGraph] = None
+
+    @property
+    def graph(self) -> CompiledStateGraph:
+        """
+        The compiled analysis graph. It is only built the first time it is needed.
+        """
+        if self._graph is None:
+            self._graph = self.create_compilation_analysis_graph(self.tools, self.decision_model, self.parsing_model,
+                                                                 self.parsing_system_prompt, self.should_stream,
+                                                                 callback_handler=self.callback_handler)
+        return self._graph
 
     def with_context(self, class_name: str, current_ms: str,
                      model_name: str, task: str) -> Optional[CallbackContext]:
@@ -110,13 +122,15 @@ class CompilationAnalysisWorkflow:
         """
         self.logger.debug("Streaming Compilation Logs Analysis Graph ---", msg_type="workflow", highlight=True)
         results = {}
-        # Execute the graph with the input messages
-        for output in self.graph.stream(input_messages):
+        # Execute the graph with the input messages. Node updates are only used for logging while the "values"
+        # events carry the graph state, so only the latest state is kept instead of every intermediate output
+        for mode, output in self.graph.stream(input_messages, stream_mode=["updates", "values"]):
+            if mode == "values":
+                results = output
+                continue
             for node_name, state_update in output.items():
-                if "messages" in state_update:
+                if state_update and "messages" in state_update:
                     log_outputs(node_name, self.logger, state_update["messages"], self.PREVIEW_LENGTH, self.verbosity)
-                    # final_state = {"messages": state_update["messages"]}
-                results = output[node_name]
         return results
 
     def _preprocess(self):
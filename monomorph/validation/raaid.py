@@ -2,12 +2,14 @@
 A module for customized RA.Aid (https://github.com/ai-christianson/RA.Aid) methods
 """
 import os
+import re
 import fnmatch
 import logging
-from pathlib import Path
+import functools
 from typing import Optional, List
 
-from fuzzywuzzy import process
+import numpy as np
+from rapidfuzz import process, fuzz, utils
 
 from .docker import MicroserviceDocker, MicroserviceDockerError
 
@@ -22,6 +24,35 @@ DEFAULT_EXCLUDE_PATTERNS = [
     "*.o",
 ]
 
+# Directories excluded from project file listings
+EXCLUDED_DIRS = frozenset({'.ra-aid', '.venv', '.git', '.aider', '__pycache__'})
+# Exclude patterns that `find -name` (matching the file name) applies exactly like fnmatch on the absolute path: a
+# leading '*' followed by a literal suffix (e.g. '*.pyc'). Other patterns such as 'Makefile' or 'build*' never match
+# an absolute path in fnmatch but would match file names in `find`, so they are left to the Python filter
+_FIND_NAME_PATTERN = re.compile(r"\*[^*?\[\]/]+")
+
+# Byte classification lookup table used to count character types in a single vectorized pass
+_CONTROL, _WHITESPACE, _PRINTABLE = 1, 2, 4
+_BYTE_CLASSES = np.zeros(256, dtype=np.uint8)
+_BYTE_CLASSES[[*range(0, 9), 11, 12, *range(14, 32)]] = _CONTROL
+_BYTE_CLASSES[[9, 10, 13, 32]] = _WHITESPACE
+_BYTE_CLASSES[33:127] = _PRINTABLE
+
+
+# Common source code headers/patterns, each compiled into a single alternation so a chunk is scanned only once
+_SOURCE_PATTERNS_REGEX = re.compile(b"|".join(map(re.escape, [
+    b'#include', b'#ifndef', b'#define', b'function', b'class', b'import', b'package', b'using namespace', b'public',
+    b'private', b'protected', b'void main', b'int main'])))
+# Source patterns still considered when the chunk contains null bytes
+_NULL_BYTE_SOURCE_PATTERNS_REGEX = re.compile(b"|".join(map(re.escape, [
+    b'#include', b'#define', b'void main', b'int main'])))
+
+
+def _count_byte_classes(chunk: bytes) -> tuple[int, int, int]:
+    """Count the control, whitespace and printable bytes in a chunk."""
+    counts = np.bincount(_BYTE_CLASSES[np.frombuffer(chunk, dtype=np.uint8)], minlength=_PRINTABLE + 1)
+    return int(counts[_CONTROL]), int(counts[_WHITESPACE]), int(counts[_PRINTABLE])
+
 
 def fuzzy_find_project_files(
         ms_docker: MicroserviceDocker,
@@ -86,13 +117,25 @@ def fuzzy_find_project_files(
         # Note: 'all_files' below this point refers to the files *after* include_paths filtering
         all_files = included_files
 
-    # Perform fuzzy matching
-    matches = process.extract(search_term, all_files, limit=max_results)
+    # Files containing the search term are exact matches and skip the fuzzy scan. A blank term would match any path
+    # containing whitespace, so it is only fuzzy scored
+    needle = search_term.lower()
+    direct_matches, candidates = [], all_files
+    if needle.strip():
+        candidates = []
+        for f in all_files:
+            if needle in f.lower():
+                direct_matches.append((f, 100))
+            else:
+                candidates.append(f)
+    if len(direct_matches) >= max_results:
+        return direct_matches[:max_results]
 
-    # Filter by threshold
-    filtered_matches = [(path, score) for path, score in matches if score >= threshold]
+    # Perform fuzzy matching (the score cutoff discards candidates below the threshold during the scan)
+    matches = process.extract(search_term, candidates, scorer=fuzz.WRatio, processor=utils.default_process,
+                              limit=max_results - len(direct_matches), score_cutoff=threshold)
 
-    return filtered_matches
+    return direct_matches + [(path, round(score)) for path, score, _ in matches]
 
 
 def get_all_project_files_docker(ms_docker: MicroserviceDocker, directory: str, include_hidden: bool = False,
@@ -112,25 +155,39 @@ def get_all_project_files_docker(ms_docker: MicroserviceDocker, directory: str,
     Raises:
         MicroserviceDockerError: If there's an error accessing or listing files in the Docker container
     """
-    # Default excluded directories
-    excluded_dirs = {'.ra-aid', '.venv', '.git', '.aider', '__pycache__'}
-    success, all_files, error_log = ms_docker.list_files(directory)
+    # Filter in the container the patterns that `find -name` applies with the same semantics
+    exclude_names = [pattern for pattern in exclude_patterns or [] if _FIND_NAME_PATTERN.fullmatch(pattern)]
+    success, all_files, error_log = ms_docker.list_files(directory, prune_dirs=EXCLUDED_DIRS,
+                                                         exclude_names=exclude_names, include_hidden=include_hidden)
     if not success:
         logger.error(f"Error listing files in directory {directory}: {error_log}")
         raise MicroserviceDockerError(f"Error listing files in directory {directory}: {error_log}")
-    # Filter out excluded directories
-    all_files = [f for f in all_files if not any([p in excluded_dirs for p in Path(f).parts])]
-    # Filter out hidden files if not included
-    if not include_hidden:
-        all_files = [f for f in all_files if not Path(f).name.startswith('.')]
-    # Apply additional exclude patterns if specified
-    if exclude_patterns:
-        for pattern in exclude_patterns:
-            all_files = [f for f in all_files if not fnmatch.fnmatch(f, pattern)]
+    # Combine the exclude patterns into a single regex (an empty alternation never matches)
+    exclude_regex = re.compile("|".join(fnmatch.translate(pattern) for pattern in exclude_patterns or []) or r"(?!)")
+    # Filter out excluded directories, hidden files (if not included) and excluded patterns in a single pass.
+    # This is a safety net for the patterns that could not be applied in the container. The container paths
+    # are posix paths so they are split directly instead of going through Path
+    all_files = [f for f in all_files
+                 if not any(p in EXCLUDED_DIRS for p in f.split('/'))
+                 and (include_hidden or not f.rsplit('/', 1)[-1].startswith('.'))
+                 and not exclude_regex.match(f)]
     # Remove duplicates and sort
     return sorted(set(all_files))
 
 
+def _read_head(filepath: str, length: int = 1024) -> bytes:
+    """Read the first bytes of a file (with a single unbuffered read where os.pread is available)."""
+    if not hasattr(os, "pread"):
+        # os.pread is not available on Windows
+        with open(filepath, 'rb') as f:
+            return f.read(length)
+    fd = os.open(filepath, os.O_RDONLY)
+    try:
+        return os.pread(fd, length, 0)
+    finally:
+        os.close(fd)
+
+
 def _is_binary_fallback(filepath):
     """Fallback method to detect binary files without using magic."""
     # Check for known source code file extensions first
@@ -143,80 +200,87 @@ def _is_binary_fallback(filepath):
     if file_ext in text_extensions:
         return False
 
+    # The result only depends on the file's content, so it is cached for unchanged files
+    file_stat = os.stat(filepath)
+    return _classify_fallback(filepath, file_stat.st_size, file_stat.st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=4096)
+def _classify_fallback(filepath: str, size: int, mtime_ns: int) -> bool:
+    """Cached content check of _is_binary_fallback for a given version (size and mtime) of a file."""
     # Check if file has C/C++ header includes
-    with open(filepath, 'rb') as f:
-        content_start = f.read(1024)
-        if b'#include' in content_start:
-            return False
+    content_start = _read_head(filepath)
+    if b'#include' in content_start:
+        return False
 
     # Fall back to content analysis
-    return _is_binary_content(filepath)
+    return _classify_content(filepath, size, mtime_ns)
 
 
 def _is_binary_content(filepath):
     """Analyze file content to determine if it's binary."""
+    try:
+        file_stat = os.stat(filepath)
+    except Exception:
+        # If any error occurs, assume binary to be safe
+        return True
+    return _classify_content(filepath, file_stat.st_size, file_stat.st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=4096)
+def _classify_content(filepath: str, size: int, mtime_ns: int) -> bool:
+    """Cached content analysis of _is_binary_content for a given version (size and mtime) of a file."""
     try:
         # First check if file is empty
-        if os.path.getsize(filepath) == 0:
+        if size == 0:
             return False  # Empty files are not binary
 
         # Check file content for patterns
-        with open(filepath, "rb") as f:
-            chunk = f.read(1024)
+        chunk = _read_head(filepath)
 
-            # Empty chunk is not binary
-            if not chunk:
-                return False
-
-            # Check for null bytes which strongly indicate binary content
-            if b"\0" in chunk:
-                # Even with null bytes, check for common source patterns
-                if (b'#include' in chunk or b'#define' in chunk or
-                        b'void main' in chunk or b'int main' in chunk):
-                    return False
-                return True
-
-            # Check for common source code headers/patterns
-            source_patterns = [b'#include', b'#ifndef', b'#define', b'function', b'class', b'import',
-                               b'package', b'using namespace', b'public', b'private', b'protected',
-                               b'void main', b'int main']
+        # Empty chunk is not binary
+        if not chunk:
+            return False
 
-            if any(pattern in chunk for pattern in source_patterns):
+        # Check for null bytes which strongly indicate binary content
+        if chunk.find(b"\0") >= 0:
+            # Even with null bytes, check for common source patterns
+            if _NULL_BYTE_SOURCE_PATTERNS_REGEX.search(chunk):
                 return False
+            return True
 
-            # Try to decode as UTF-8
-            try:
-                chunk.decode('utf-8')
+        # Check for common source code headers/patterns
+        if _SOURCE_PATTERNS_REGEX.search(chunk):
+            return False
 
-                # Count various character types to determine if it's text
-                control_chars = sum(0 <= byte <= 8 or byte == 11 or byte == 12 or 14 <= byte <= 31 for byte in chunk)
-                whitespace = sum(byte == 9 or byte == 10 or byte == 13 or byte == 32 for byte in chunk)
-                printable = sum(33 <= byte <= 126 for byte in chunk)
+        # Try to decode as UTF-8
+        try:
+            chunk.decode('utf-8')
 
-                # Calculate ratios
-                control_ratio = control_chars / len(chunk)
-                printable_ratio = (printable + whitespace) / len(chunk)
+            # Count various character types to determine if it's text
+            control_chars, whitespace, printable = _count_byte_classes(chunk)
 
-                # Text files have high printable ratio and low control ratio
-                if control_ratio < 0.2 and printable_ratio > 0.7:
-                    return False
+            # Calculate ratios
+            control_ratio = control_chars / len(chunk)
+            printable_ratio = (printable + whitespace) / len(chunk)
 
-                return True
+            # Text files have high printable ratio and low control ratio
+            if control_ratio < 0.2 and printable_ratio > 0.7:
+                return False
 
-            except UnicodeDecodeError:
-                # Try another encoding if UTF-8 fails
-                # latin-1 always succeeds but helps with encoding detection
-                latin_chunk = chunk.decode('latin-1')
+            return True
 
-                # Count the printable vs non-printable characters
-                printable = sum(32 <= ord(char) <= 126 or ord(char) in (9, 10, 13) for char in latin_chunk)
-                printable_ratio = printable / len(latin_chunk)
+        except UnicodeDecodeError:
+            # Try another encoding if UTF-8 fails
+            # latin-1 maps each byte to the same code point, so the byte counts can be used directly
+            _, whitespace, printable = _count_byte_classes(chunk)
+            printable_ratio = (printable + whitespace) / len(chunk)
 
-                # If more than 70% is printable, it's likely text
-                if printable_ratio > 0.7:
-                    return False
+            # If more than 70% is printable, it's likely text
+            if printable_ratio > 0.7:
+                return False
 
-                return True
+            return True
 
     except Exception:
         # If any error occurs, assume binary to be safe
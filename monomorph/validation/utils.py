@@ -1,9 +1,10 @@
 import os
+import sys
 import logging
 import re
-from pathlib import Path
+import functools
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Iterator
 
 from .raaid import _is_binary_fallback
 
@@ -14,6 +15,26 @@ from ..microservice import MicroserviceDirectory
 
 logger = logging.getLogger("monomorph")
 
+# Prefix of the paths within the default Docker workdir (see parse_docker_path)
+_DOCKER_WORKDIR_PREFIX = DEFAULT_DOCKER_WORKDIR.rstrip("/") + "/"
+
+# Patterns used to extract the FQN of a Java type (see extract_java_fqn)
+# Java identifiers are assumed to be ASCII (the JLS allows Unicode but it is hardly used in practice), which lets
+# \w and \s use the smaller ASCII character classes
+_JAVA_COMMENT_REGEX = re.compile(r"/\*.*?\*/|//[^\n]*", re.DOTALL)
+_JAVA_PACKAGE_REGEX = re.compile(r"^\s*package\s+([\w\.]+);", re.MULTILINE | re.ASCII)
+# The whitespace and modifiers are matched possessively, since giving them back can never lead to a match, so that a
+# failed attempt does not backtrack through every way of splitting them
+_JAVA_PUBLIC_TYPE_REGEX = re.compile(
+    r"public\s++(?:abstract\s++|final\s++)?+(class|interface|enum|record)\s++([a-zA-Z_]\w*)",
+    re.ASCII
+)
+_JAVA_ANY_TYPE_REGEX = re.compile(
+    r"^(?:public\s++|protected\s++|private\s++)?+\s*+(?:abstract\s++|static\s++|final\s++|sealed\s++)?+"
+    r"(class|interface|enum|record)\s++([a-zA-Z_]\w*)",
+    re.MULTILINE | re.ASCII
+)
+
 
 def parse_docker_path(
         file_path: str,
@@ -49,6 +70,14 @@ def parse_docker_path(
     """
     if not file_path:
         return actual_root
+    # Fast path for already normalized paths within the default workdir (the common case in Docker logs)
+    if workdir_mappings is None and file_path.startswith(_DOCKER_WORKDIR_PREFIX):
+        relative_part = file_path[len(_DOCKER_WORKDIR_PREFIX):]
+        if not relative_part:
+            return actual_root
+        if all(part not in ("", ".", "..") for part in relative_part.split("/")):
+            separator = "" if actual_root.endswith(os.sep) else os.sep
+            return actual_root + separator + relative_part
     # Normalize the input path
     normalized_path = os.path.normpath(file_path)
     # Set up workdir mappings
@@ -80,61 +109,79 @@ def parse_docker_path(
     return normalized_path
 
 
+def _fast_relpath(path: str, root: str) -> str:
+    """
+    Equivalent of os.path.relpath for paths that are located within the root directory, which only strips the root
+    prefix instead of resolving both paths. Falls back to os.path.relpath for any other path.
+    """
+    if path == root:
+        return "."
+    root_prefix = root if root.endswith(os.sep) else root + os.sep
+    if path.startswith(root_prefix):
+        relative_path = path[len(root_prefix):]
+        if all(part not in ("", ".", "..") for part in relative_path.split(os.sep)):
+            return relative_path
+    return os.path.relpath(path, root)
+
+
 def compile_generated_classes_files(microservice: MicroserviceDirectory, helper_manager: HelperManager,
-                                    language: str = "java") -> tuple[list[str], dict[str, Path], dict[str, tuple[str, str]]]:
+                                    language: str = "java") -> tuple[list[str], dict[str, str], dict[str, tuple[str, str]]]:
     generated_files = []
     generated_classes = {}
     refactoring_details = {}
+    ms_root = microservice.directory_path
+    helper_mapping = helper_manager.helper_mapping
     if microservice.new_server:
         for sc, service_details in microservice.new_server.items():
             generated_files.append(service_details["path"])
-            generated_classes[service_details["full_name"]] = Path(service_details["path"])
-            relative_path = os.path.relpath(service_details["path"], microservice.directory_path)
+            generated_classes[sys.intern(service_details["full_name"])] = service_details["path"]
+            relative_path = sys.intern(_fast_relpath(service_details["path"], ms_root))
             refactoring_details[relative_path] = (service_details["prompt"], service_details["explanation"])
     if microservice._new_proto:
         for proto, proto_details in microservice._new_proto.items():
             generated_files.append(proto_details["path"])
-            relative_path = os.path.relpath(proto_details["path"], microservice.directory_path)
+            relative_path = sys.intern(_fast_relpath(proto_details["path"], ms_root))
             refactoring_details[relative_path] = (proto_details["prompt"], proto_details["explanation"])
     if microservice._new_client:
         for client, client_details in microservice._new_client.items():
             generated_files.append(client_details["path"])
-            generated_classes[client_details["full_name"]] = Path(client_details["path"])
-            relative_path = os.path.relpath(client_details["path"], microservice.directory_path)
+            generated_classes[sys.intern(client_details["full_name"])] = client_details["path"]
+            relative_path = sys.intern(_fast_relpath(client_details["path"], ms_root))
             refactoring_details[relative_path] = (client_details["prompt"], client_details["explanation"])
     if microservice._new_other:
         for other, other_details in microservice._new_other.items():
             generated_files.append(other_details["mapper_path"])
-            generated_classes[other_details["mapper_full_name"]] = Path(other_details["mapper_path"])
-            relative_path = os.path.relpath(other_details["mapper_path"], microservice.directory_path)
+            generated_classes[sys.intern(other_details["mapper_full_name"])] = other_details["mapper_path"]
+            relative_path = sys.intern(_fast_relpath(other_details["mapper_path"], ms_root))
             refactoring_details[relative_path] = ("", other_details["explanation"])
     if microservice._included_helpers:
         for helper, path in microservice._included_helpers.items():
             generated_files.append(path)
-            relative_path = os.path.relpath(path, microservice.directory_path)
-            refactoring_details[relative_path] = ("", helper_manager.helper_mapping[helper]["description"])
+            relative_path = sys.intern(_fast_relpath(path, ms_root))
+            refactoring_details[relative_path] = ("", helper_mapping[helper]["description"])
             if path.endswith(language):
                 # If the helper is a class file, add it to generated_classes
                 helper_class = helper_manager.get_as_class(helper)
                 if helper_class.full_name is not None:
-                    generated_classes[helper_class.full_name] = Path(path)
+                    generated_classes[sys.intern(helper_class.full_name)] = path
     if microservice._generated_helpers:
         for name, helper_details in microservice._generated_helpers.items():
             path, helper = helper_details[0], helper_details[1]
-            relative_path = os.path.relpath(path, microservice.directory_path)
-            refactoring_details[relative_path] = ("", helper_manager.helper_mapping[helper]["description"])
+            helper_info = helper_mapping[helper]
+            relative_path = sys.intern(_fast_relpath(path, ms_root))
+            refactoring_details[relative_path] = ("", helper_info["description"])
             generated_files.append(path)
-            package_name = helper_manager.helper_mapping[helper]["package"]
+            package_name = helper_info["package"]
             full_name = f"{package_name}.{name}"
-            generated_classes[full_name] = Path(path)
+            generated_classes[sys.intern(full_name)] = path
     for key, details in [("grpc", microservice._entrypoint_grpc_details),
                          ("combined", microservice._combined_main_details)]:
         if details:
             path = details["path"]
             generated_files.append(path)
             class_name = details["full_name"]
-            generated_classes[class_name] = Path(path)
-            relative_path = os.path.relpath(path, microservice.directory_path)
+            generated_classes[sys.intern(class_name)] = path
+            relative_path = sys.intern(_fast_relpath(path, ms_root))
             refactoring_details[relative_path] = ("", details["explanation"])
     return generated_files, generated_classes, refactoring_details
 
@@ -151,12 +198,16 @@ def is_binary_file(filepath: str) -> bool:
     Returns:
         bool: True if the file is binary, False if it is text.
     """
-    extensions_not_in_raaid = [".log", ".csv", "tsv", ".proto", ".pb", ".jsonl", ".class", ".gradle", ".build"]
-    file_root, file_ext = os.path.splitext(filepath)
-    filename_without_extension = os.path.basename(file_root)
-    if file_ext in extensions_not_in_raaid:
+    # Get the file name and its extension in a single scan of the path
+    filename = filepath[filepath.rfind(os.sep) + 1:]
+    dot_index = filename.rfind('.')
+    file_ext = filename[dot_index:].lower() if dot_index > 0 else ''
+    # Known extensions are decided without reading the file
+    if file_ext in _KNOWN_TEXT_EXTENSIONS:
         return False
-    if "Dockerfile" in filename_without_extension:
+    if file_ext in _KNOWN_BINARY_EXTENSIONS:
+        return True
+    if "Dockerfile" in filename:
         # If the file has a Dockerfile name, we assume it is text
         return False
     try:
@@ -166,6 +217,160 @@ def is_binary_file(filepath: str) -> bool:
         return True
 
 
+# Extension to markdown code block language mapping (see get_markdown_language)
+_MARKDOWN_EXTENSION_LANGUAGES = {
+    # Python
+    '.py': 'python',
+    '.pyw': 'python',
+    '.pyi': 'python',
+    # JavaScript/TypeScript
+    '.js': 'javascript',
+    '.jsx': 'jsx',
+    '.ts': 'typescript',
+    '.tsx': 'tsx',
+    '.mjs': 'javascript',
+    '.cjs': 'javascript',
+    # Web technologies
+    '.html': 'html',
+    '.htm': 'html',
+    '.css': 'css',
+    '.scss': 'scss',
+    '.sass': 'sass',
+    '.less': 'less',
+    # C/C++
+    '.c': 'c',
+    '.h': 'c',
+    '.cpp': 'cpp',
+    '.cxx': 'cpp',
+    '.cc': 'cpp',
+    '.hpp': 'cpp',
+    '.hxx': 'cpp',
+    # Java
+    '.java': 'java',
+    '.class': 'java',
+    # C#
+    '.cs': 'csharp',
+    '.csx': 'csharp',
+    # Shell/Bash
+    '.sh': 'bash',
+    '.bash': 'bash',
+    '.zsh': 'zsh',
+    '.fish': 'fish',
+    '.ps1': 'powershell',
+    '.psm1': 'powershell',
+    # Ruby
+    '.rb': 'ruby',
+    '.rbw': 'ruby',
+    # PHP
+    '.php': 'php',
+    '.php3': 'php',
+    '.php4': 'php',
+    '.php5': 'php',
+    '.phtml': 'php',
+    # Go
+    '.go': 'go',
+    # Rust
+    '.rs': 'rust',
+    # Swift
+    '.swift': 'swift',
+    # Kotlin
+    '.kt': 'kotlin',
+    '.kts': 'kotlin',
+    # Scala
+    '.scala': 'scala',
+    '.sc': 'scala',
+    # R
+    '.r': 'r',
+    '.R': 'r',
+    # SQL
+    '.sql': 'sql',
+    # YAML
+    '.yaml': 'yaml',
+    '.yml': 'yaml',
+    # JSON
+    '.json': 'json',
+    '.jsonl': 'json',
+    # XML
+    '.xml': 'xml',
+    '.xsl': 'xml',
+    '.xsd': 'xml',
+    # Markdown
+    '.md': 'markdown',
+    '.markdown': 'markdown',
+    '.mdown': 'markdown',
+    '.mkd': 'markdown',
+    # Configuration files
+    '.toml': 'toml',
+    '.ini': 'ini',
+    '.cfg': 'ini',
+    '.conf': 'ini',
+    # Docker
+    '.dockerfile': 'dockerfile',
+    # Vim
+    '.vim': 'vim',
+    '.vimrc': 'vim',
+    # Lua
+    '.lua': 'lua',
+    # Perl
+    '.pl': 'perl',
+    '.pm': 'perl',
+    # Haskell
+    '.hs': 'haskell',
+    '.lhs': 'haskell',
+    # Erlang/Elixir
+    '.erl': 'erlang',
+    '.ex': 'elixir',
+    '.exs': 'elixir',
+    # Clojure
+    '.clj': 'clojure',
+    '.cljs': 'clojure',
+    '.cljc': 'clojure',
+    # F#
+    '.fs': 'fsharp',
+    '.fsx': 'fsharp',
+    # OCaml
+    '.ml': 'ocaml',
+    '.mli': 'ocaml',
+    # Dart
+    '.dart': 'dart',
+    # Assembly
+    '.asm': 'assembly',
+    '.s': 'assembly',
+    # Makefile
+    '.makefile': 'makefile',
+    # Plain text
+    '.txt': 'text',
+    '.log': 'text',
+    # LaTeX
+    '.tex': 'latex',
+    '.cls': 'latex',
+    '.sty': 'latex',
+}
+
+# Special filename to markdown code block language mapping (see get_markdown_language)
+_MARKDOWN_SPECIAL_FILES = {
+    'makefile': 'makefile',
+    'dockerfile': 'dockerfile',
+    'rakefile': 'ruby',
+    'gemfile': 'ruby',
+    'vagrantfile': 'ruby',
+    'cmakelists.txt': 'cmake',
+    '.gitignore': 'gitignore',
+    '.bashrc': 'bash',
+    '.zshrc': 'zsh',
+    '.vimrc': 'vim',
+}
+
+# Extensions that is_binary_file classifies without opening the file
+_KNOWN_BINARY_EXTENSIONS = frozenset({
+    ".class", ".pb", ".jar", ".war", ".zip", ".png", ".jpg", ".jpeg", ".gif", ".so", ".dll", ".exe"
+})
+# The markdown mapping includes compiled Java classes for highlighting purposes, which are not text
+_KNOWN_TEXT_EXTENSIONS = (frozenset(_MARKDOWN_EXTENSION_LANGUAGES) | {
+    ".log", ".csv", ".tsv", ".proto", ".jsonl", ".gradle", ".build", ".properties"
+}) - _KNOWN_BINARY_EXTENSIONS
+
+
 def get_markdown_language(file_path: str) -> str:
     """
     Determine the markdown code block language identifier based on file extension.
@@ -176,158 +381,16 @@ def get_markdown_language(file_path: str) -> str:
     Returns:
         str: Language identifier for markdown code blocks, or empty string if unknown
     """
-
-    # Extension to language mapping
-    extension_map = {
-        # Python
-        '.py': 'python',
-        '.pyw': 'python',
-        '.pyi': 'python',
-        # JavaScript/TypeScript
-        '.js': 'javascript',
-        '.jsx': 'jsx',
-        '.ts': 'typescript',
-        '.tsx': 'tsx',
-        '.mjs': 'javascript',
-        '.cjs': 'javascript',
-        # Web technologies
-        '.html': 'html',
-        '.htm': 'html',
-        '.css': 'css',
-        '.scss': 'scss',
-        '.sass': 'sass',
-        '.less': 'less',
-        # C/C++
-        '.c': 'c',
-        '.h': 'c',
-        '.cpp': 'cpp',
-        '.cxx': 'cpp',
-        '.cc': 'cpp',
-        '.hpp': 'cpp',
-        '.hxx': 'cpp',
-        # Java
-        '.java': 'java',
-        '.class': 'java',
-        # C#
-        '.cs': 'csharp',
-        '.csx': 'csharp',
-        # Shell/Bash
-        '.sh': 'bash',
-        '.bash': 'bash',
-        '.zsh': 'zsh',
-        '.fish': 'fish',
-        '.ps1': 'powershell',
-        '.psm1': 'powershell',
-        # Ruby
-        '.rb': 'ruby',
-        '.rbw': 'ruby',
-        # PHP
-        '.php': 'php',
-        '.php3': 'php',
-        '.php4': 'php',
-        '.php5': 'php',
-        '.phtml': 'php',
-        # Go
-        '.go': 'go',
-        # Rust
-        '.rs': 'rust',
-        # Swift
-        '.swift': 'swift',
-        # Kotlin
-        '.kt': 'kotlin',
-        '.kts': 'kotlin',
-        # Scala
-        '.scala': 'scala',
-        '.sc': 'scala',
-        # R
-        '.r': 'r',
-        '.R': 'r',
-        # SQL
-        '.sql': 'sql',
-        # YAML
-        '.yaml': 'yaml',
-        '.yml': 'yaml',
-        # JSON
-        '.json': 'json',
-        '.jsonl': 'json',
-        # XML
-        '.xml': 'xml',
-        '.xsl': 'xml',
-        '.xsd': 'xml',
-        # Markdown
-        '.md': 'markdown',
-        '.markdown': 'markdown',
-        '.mdown': 'markdown',
-        '.mkd': 'markdown',
-        # Configuration files
-        '.toml': 'toml',
-        '.ini': 'ini',
-        '.cfg': 'ini',
-        '.conf': 'ini',
-        # Docker
-        '.dockerfile': 'dockerfile',
-        # Vim
-        '.vim': 'vim',
-        '.vimrc': 'vim',
-        # Lua
-        '.lua': 'lua',
-        # Perl
-        '.pl': 'perl',
-        '.pm': 'perl',
-        # Haskell
-        '.hs': 'haskell',
-        '.lhs': 'haskell',
-        # Erlang/Elixir
-        '.erl': 'erlang',
-        '.ex': 'elixir',
-        '.exs': 'elixir',
-        # Clojure
-        '.clj': 'clojure',
-        '.cljs': 'clojure',
-        '.cljc': 'clojure',
-        # F#
-        '.fs': 'fsharp',
-        '.fsx': 'fsharp',
-        # OCaml
-        '.ml': 'ocaml',
-        '.mli': 'ocaml',
-        # Dart
-        '.dart': 'dart',
-        # Assembly
-        '.asm': 'assembly',
-        '.s': 'assembly',
-        # Makefile
-        '.makefile': 'makefile',
-        # Plain text
-        '.txt': 'text',
-        '.log': 'text',
-        # LaTeX
-        '.tex': 'latex',
-        '.cls': 'latex',
-        '.sty': 'latex',
-    }
-    # Get the file extension
-    ext = Path(file_path).suffix.lower()
     # Handle special cases for files without extensions
-    filename = Path(file_path).name.lower()
-    # Special filename mappings
-    special_files = {
-        'makefile': 'makefile',
-        'dockerfile': 'dockerfile',
-        'rakefile': 'ruby',
-        'gemfile': 'ruby',
-        'vagrantfile': 'ruby',
-        'cmakelists.txt': 'cmake',
-        '.gitignore': 'gitignore',
-        '.bashrc': 'bash',
-        '.zshrc': 'zsh',
-        '.vimrc': 'vim',
-    }
+    filename = os.path.basename(file_path.rstrip(os.sep)).lower()
+    # Get the file extension (same rules as Path.suffix: a leading or trailing dot is not an extension)
+    dot_index = filename.rfind('.')
+    ext = filename[dot_index:] if 0 < dot_index < len(filename) - 1 else ''
     # Check special filenames first
-    if filename in special_files:
-        return special_files[filename]
+    if filename in _MARKDOWN_SPECIAL_FILES:
+        return _MARKDOWN_SPECIAL_FILES[filename]
     # Check extension mapping
-    return extension_map.get(ext, '')
+    return _MARKDOWN_EXTENSION_LANGUAGES.get(ext, '')
 
 
 def format_file_for_markdown(file_path: str, content: str) -> str:
@@ -341,15 +404,11 @@ def format_file_for_markdown(file_path: str, content: str) -> str:
     Returns:
         str: Formatted markdown string
     """
-    language = get_markdown_language(file_path)
 #     markdown_content = f"""file path: {file_path}
 # ```{language}
 # {content}
 # ```"""
-    markdown_content = f"""--- START OF FILE {file_path} ---
-{content}
---- END OF FILE {file_path} ---"""
-    return markdown_content
+    return "".join(("--- START OF FILE ", file_path, " ---\n", content, "\n--- END OF FILE ", file_path, " ---"))
 
 
 def parse_find_details(find_details: list[str]) -> dict[str, dict]:
@@ -362,6 +421,8 @@ def parse_find_details(find_details: list[str]) -> dict[str, dict]:
         the file and directory details as a dictionary.
     """
     data = {}
+    # Many files share the same modification second, so each second is formatted only once
+    readable_mtimes: dict[datetime, str] = {}
     for line in find_details:
         parts = line.split('|')
         if len(parts) >= 5:
@@ -369,7 +430,11 @@ def parse_find_details(find_details: list[str]) -> dict[str, dict]:
 
             # Convert timestamp to readable format
             try:
-                mtime_readable = datetime.fromtimestamp(float(mtime_epoch)).strftime('%Y-%m-%d %H:%M:%S')
+                mtime_second = datetime.fromtimestamp(float(mtime_epoch)).replace(microsecond=0)
+                mtime_readable = readable_mtimes.get(mtime_second)
+                if mtime_readable is None:
+                    mtime_readable = mtime_second.strftime('%Y-%m-%d %H:%M:%S')
+                    readable_mtimes[mtime_second] = mtime_readable
             except (ValueError, OSError):
                 mtime_readable = 'unknown'
 
@@ -386,116 +451,118 @@ def parse_find_details(find_details: list[str]) -> dict[str, dict]:
     return data
 
 
+# Reserved keys holding a tree node's details, the other keys of a node are its children (see build_tree_structure).
+# They are not strings so that they can never collide with the name of a file or directory
+_TREE_INFO_KEY = object()
+_TREE_PATH_KEY = object()
+_TREE_METADATA_KEYS = (_TREE_INFO_KEY, _TREE_PATH_KEY)
+
+
 def build_tree_structure(files_data: dict, root_path: str) -> dict:
     """Build a tree structure from flat file list."""
     tree = {}
+    sep = os.sep
 
     for file_path, file_info in files_data.items():
         # Skip the root directory itself
         if file_path == root_path:
             continue
 
-        # Get relative path from root
+        # Get relative path from root (the listed paths are usually within the root, so its prefix is just stripped)
         try:
-            rel_path = os.path.relpath(file_path, root_path)
-            if rel_path.startswith('..'):
-                continue
+            rel_path = _fast_relpath(file_path, root_path)
         except ValueError:
             continue
 
         # Split path into parts
-        parts = rel_path.split(os.sep)
-        current = tree
+        parts = rel_path.split(sep)
+        if parts[0] == '..':
+            continue
 
-        # Build nested structure
-        for i, part in enumerate(parts):
-            if part not in current:
-                current[part] = {'_info': None, '_children': {}}
+        # Build nested structure, each node holds its children and its details under the reserved keys
+        current = tree
+        for part in parts:
+            current = current.setdefault(part, {})
+        current[_TREE_INFO_KEY] = file_info
+        current[_TREE_PATH_KEY] = file_path
+    return tree
 
-            if i == len(parts) - 1:  # Last part (file/directory name)
-                current[part]['_info'] = file_info
-                current[part]['_path'] = file_path
 
-            current = current[part]['_children']
-    return tree
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
 
 
 def format_size(size_bytes: int) -> str:
     """Format file size in human-readable format."""
     if size_bytes == 0:
         return "0B"
+    if size_bytes < 1024:
+        return f"{size_bytes:.1f}B"
 
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size_bytes < 1024:
-            return f"{size_bytes:.1f}{unit}"
-        size_bytes /= 1024
-    return f"{size_bytes:.1f}TB"
+    # Each unit is 2^10 times the previous one, so the unit index is given by the position of the highest set bit
+    unit_index = min((size_bytes.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (unit_index * 10)):.1f}{_SIZE_UNITS[unit_index]}"
 
 
-def render_tree(tree: dict, prefix: str = "", is_last: bool = True, root_path: str = "", include_can_modif: bool = True,
-                include_changed: bool = True, include_modif_time_size: bool = False) -> list[str]:
-    """Render tree structure with enriched information."""
-    lines = []
+def _push_tree_children(stack: list, node: dict, prefix: str):
+    """Push the children of a tree node on the rendering stack in reverse order so they are popped in order."""
+    children = [(name, data) for name, data in node.items() if name not in _TREE_METADATA_KEYS]
+    last_index = len(children) - 1
+    for i in range(last_index, -1, -1):
+        name, data = children[i]
+        stack.append((name, data, prefix, i == last_index))
+
 
-    items = list(tree.items())
-    for i, (name, data) in enumerate(items):
-        is_last_item = i == len(items) - 1
+def render_tree(tree: dict, prefix: str = "", is_last: bool = True, root_path: str = "", include_can_modif: bool = True,
+                include_changed: bool = True, include_modif_time_size: bool = False) -> Iterator[str]:
+    """Render tree structure with enriched information. The lines are yielded one by one as they are rendered."""
+    # The status of a file only depends on whether it can be modified and whether it changed, so the strings for
+    # every combination are built once
+    status_strings = {}
+    for can_modify in (True, False):
+        for is_changed in (True, False):
+            status_indicators = []
+            if include_can_modif:
+                status_indicators.append("WRITABLE" if can_modify else "READ-ONLY")
+            if include_changed:
+                status_indicators.append("CHANGED" if is_changed else "UNCHANGED")
+            status_strings[(can_modify, is_changed)] = (" [" + ", ".join(status_indicators) + "]"
+                                                        if status_indicators else "")
+
+    # Depth-first traversal with an explicit stack of (name, node, prefix, is_last) entries
+    stack = []
+    _push_tree_children(stack, tree, prefix)
+    while stack:
+        name, data, item_prefix, is_last_item = stack.pop()
 
         # Determine tree symbols
         current_prefix = "└── " if is_last_item else "├── "
-        next_prefix = prefix + ("    " if is_last_item else "│   ")
 
         # Get file information
-        file_info = data.get('_info', {})
-        file_path = data.get('_path', '')
+        file_info = data.get(_TREE_INFO_KEY, {})
 
         if file_info:
-            # Use internal data to determine file status
-            is_changed = file_info.get('is_changed', False)
-            can_modify = file_info.get('can_modify', True)
-            # Build status indicators
             # Format file line
             if file_info.get('is_file', False):
-                status_indicators = []
-                if include_can_modif:
-                    if can_modify:
-                        status_indicators.append("WRITABLE")
-                    else:
-                        status_indicators.append("READ-ONLY")
-                if include_changed:
-                    if is_changed:
-                        status_indicators.append(f"CHANGED")
-                    else:
-                        status_indicators.append(f"UNCHANGED")
+                # Use internal data to determine file status
+                status_str = status_strings[(bool(file_info.get('can_modify', True)),
+                                             bool(file_info.get('is_changed', False)))]
                 if include_modif_time_size:
                     size_str = format_size(file_info.get('size', 0))
                     mtime_str = file_info.get('mtime', 'unknown')
                     size_time_str = f"({size_str}, {mtime_str})"
                 else:
                     size_time_str = ""
-                status_str = " [" + ", ".join(status_indicators) + "]" if status_indicators else ""
-                line = f"{prefix}{current_prefix}{name} {size_time_str}{status_str}"
+                line = f"{item_prefix}{current_prefix}{name} {size_time_str}{status_str}"
             else:
                 # Directory
-                line = f"{prefix}{current_prefix}{name}/"
-            lines.append(line)
+                line = f"{item_prefix}{current_prefix}{name}/"
+            yield line
         else:
             # No file info available
-            line = f"{prefix}{current_prefix}{name}"
-            lines.append(line)
-
-        # Recurse into children
-        if data['_children']:
-            lines.extend(render_tree(
-                data['_children'],
-                next_prefix,
-                is_last_item,
-                root_path,
-                include_can_modif=include_can_modif,
-                include_changed=include_changed,
-                include_modif_time_size=include_modif_time_size
-            ))
-    return lines
+            yield f"{item_prefix}{current_prefix}{name}"
+
+        # Queue the children so they are rendered right after this node
+        _push_tree_children(stack, data, item_prefix + ("    " if is_last_item else "│   "))
 
 
 def get_class_name_from_content(content: str, language: str = "java") -> Optional[str]:
@@ -525,15 +592,21 @@ def extract_java_fqn(source_code: str) -> Optional[str]:
     """
     if not isinstance(source_code, str):
         raise TypeError("source_code must be a string.")
+    return _extract_java_fqn(source_code)
+
 
+@functools.lru_cache(maxsize=4096)
+def _extract_java_fqn(source_code: str) -> Optional[str]:
+    """ Cached implementation of extract_java_fqn since the same sources (e.g. helpers) are parsed repeatedly. """
     # A simple way to remove comments to avoid matching keywords inside them.
-    # Remove block comments /* ... */
-    code_no_blocks = re.sub(r"/\*.*?\*/", "", source_code, flags=re.DOTALL)
-    # Remove line comments // ...
-    code_no_comments = re.sub(r"//.*", "", code_no_blocks)
+    # Remove block comments /* ... */ and line comments // ... in a single pass (only if there might be any)
+    if "/*" in source_code or "//" in source_code:
+        code_no_comments = _JAVA_COMMENT_REGEX.sub("", source_code)
+    else:
+        code_no_comments = source_code
 
     # Looks for a line like "package com.example.project;"
-    package_match = re.search(r"^\s*package\s+([\w\.]+);", code_no_comments, re.MULTILINE)
+    package_match = _JAVA_PACKAGE_REGEX.search(code_no_comments)
     package_name = package_match.group(1) if package_match else None
 
     # Looks for "public class MyClass", "public interface MyInterface", etc.
@@ -545,18 +618,11 @@ def extract_java_fqn(source_code: str) -> Optional[str]:
     # (class|interface|enum|record) - matches the type keyword
     # \s+                     - one or more spaces
     # ([a-zA-Z_]\w*)          - captures the valid Java identifier for the name
-    type_match = re.search(
-        r"public\s+(?:abstract\s+|final\s+)?(class|interface|enum|record)\s+([a-zA-Z_]\w*)",
-        code_no_comments
-    )
+    type_match = _JAVA_PUBLIC_TYPE_REGEX.search(code_no_comments)
 
     # If no public type is found, fall back to any top-level type
     if not type_match:
-        type_match = re.search(
-            r"^(?:public\s+|protected\s+|private\s+)?\s*(?:abstract\s+|static\s+|final\s+|sealed\s+)?(class|interface|enum|record)\s+([a-zA-Z_]\w*)",
-            code_no_comments,
-            re.MULTILINE
-        )
+        type_match = _JAVA_ANY_TYPE_REGEX.search(code_no_comments)
 
     class_name = type_match.group(2) if type_match else None
 
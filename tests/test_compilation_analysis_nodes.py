@@ -0,0 +1,98 @@
+import json
+import unittest
+from unittest.mock import MagicMock
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from monomorph.validation.log_analysis.models import CompilationAnalysisReport
+from monomorph.validation.log_analysis.nodes import repair_parsed_output, define_compilation_analysis_nodes
+
+
+REPORT = {
+    "analysis_results": [{
+        "error_summary": "Missing import for a DTO class in the gRPC service implementation",
+        "detailed_explanation": "The service implementation uses OrderDTO without importing it.",
+        "log_start_line": 10,
+        "log_end_line": 12,
+        "affected_files": [["src/main/java/com/example/OrderServiceImpl.java", "Add the missing import"]],
+        "solution_plan": ["Import com.example.dto.OrderDTO in OrderServiceImpl"],
+    }]
+}
+REPORT_JSON = json.dumps(REPORT, indent=2)
+
+
+class TestRepairParsedOutput(unittest.TestCase):
+
+    def test_tool_call_arguments(self):
+        """Test that the report is recovered from the arguments of the structured output tool call."""
+        raw = AIMessage(content="", tool_calls=[
+            {"name": CompilationAnalysisReport.__name__, "args": REPORT, "id": "call_0"}
+        ])
+        self.assertEqual(repair_parsed_output(raw), CompilationAnalysisReport.model_validate(REPORT))
+
+    def test_fenced_json(self):
+        """Test that the report is recovered from JSON wrapped in a markdown code block."""
+        raw = AIMessage(content=f"```json\n{REPORT_JSON}\n```")
+        self.assertEqual(repair_parsed_output(raw), CompilationAnalysisReport.model_validate(REPORT))
+
+    def test_json_in_prose(self):
+        """Test that the report is recovered from JSON surrounded by text."""
+        raw = AIMessage(content=f"Here is the report:\n{REPORT_JSON}\nLet me know if you need anything else.")
+        self.assertEqual(repair_parsed_output(raw), CompilationAnalysisReport.model_validate(REPORT))
+
+    def test_invalid_json(self):
+        """Test that malformed JSON is not recovered."""
+        raw = AIMessage(content=f"```json\n{REPORT_JSON[:-10]}\n}}\n```")
+        self.assertIsNone(repair_parsed_output(raw))
+
+    def test_invalid_schema(self):
+        """Test that JSON that does not match the report schema is not recovered."""
+        self.assertIsNone(repair_parsed_output(AIMessage(content='{"analysis_results": [{"error_summary": "x"}]}')))
+        raw = AIMessage(content="", tool_calls=[{"name": "report", "args": {"results": []}, "id": "call_0"}])
+        self.assertIsNone(repair_parsed_output(raw))
+
+    def test_no_json(self):
+        """Test that a reply without JSON or a non AI message is not recovered."""
+        self.assertIsNone(repair_parsed_output(AIMessage(content="The compilation failed.")))
+        self.assertIsNone(repair_parsed_output(HumanMessage(content=REPORT_JSON)))
+        self.assertIsNone(repair_parsed_output(None))
+
+
+class TestParsingNodes(unittest.TestCase):
+
+    def setUp(self):
+        self.parser_model = MagicMock()
+        _, _, self.parse_output, self.check_parsing_status = define_compilation_analysis_nodes(
+            MagicMock(), self.parser_model)
+
+    def test_parse_output_repairs_raw_response(self):
+        """Test that the parsing node recovers the report from the raw response when the structured output failed."""
+        self.parser_model.invoke.return_value = {"parsed": None, "raw": AIMessage(content=f"```{REPORT_JSON}```"),
+                                                 "parsing_error": ValueError("invalid JSON")}
+        result = self.parse_output({"messages": [AIMessage(content="The analysis")]})
+        self.assertEqual(result["compilation_report"], CompilationAnalysisReport.model_validate(REPORT))
+        self.assertEqual(result["parsing_attempts"], 1)
+        self.assertEqual(self.parser_model.invoke.call_count, 1)
+
+    def test_valid_report_ends(self):
+        """Test that the workflow ends once the report is parsed."""
+        state = {"compilation_report": CompilationAnalysisReport.model_validate(REPORT), "parsing_attempts": 1}
+        self.assertEqual(self.check_parsing_status(state), "__end__")
+
+    def test_invalid_report_is_retried_up_to_the_limit(self):
+        """Test that an invalid non-empty report is retried until the maximum number of parsing attempts."""
+        invalid_report = {"parsed": None, "raw": AIMessage(content="not a report")}
+        self.assertEqual(self.check_parsing_status({"compilation_report": invalid_report, "parsing_attempts": 1}),
+                         "retry_parsing")
+        self.assertEqual(self.check_parsing_status({"compilation_report": invalid_report, "parsing_attempts": 2}),
+                         "__end__")
+
+    def test_missing_report_is_retried_up_to_the_limit(self):
+        """Test that a missing report is retried until the maximum number of parsing attempts."""
+        self.assertEqual(self.check_parsing_status({"compilation_report": None, "parsing_attempts": 1}),
+                         "retry_parsing")
+        self.assertEqual(self.check_parsing_status({"compilation_report": None, "parsing_attempts": 2}), "__end__")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,20 +3,28 @@ import unittest
 import tempfile
 import pathlib
 import shutil
+import functools
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch, MagicMock
 
 import docker
 import dotenv
 
 from monomorph.validation.compilation import CompilationRunner
+from monomorph.validation.const import DEFAULT_DOCKER_WORKDIR
+from monomorph.validation.docker import MicroserviceDocker
+
+
+dotenv.load_dotenv()
+CUSTOM_DOCKER_SOCKET = os.getenv("CUSTOM_DOCKER_SOCKET")
 
 
 # --- Helper function to check for Docker availability ---
+@functools.lru_cache(maxsize=1)
 def is_docker_running():
-    """Checks if the Docker daemon is responsive."""
+    """Checks if the Docker daemon is responsive (only pinged once per test session)."""
     try:
-        dotenv.load_dotenv()
-        CUSTOM_DOCKER_SOCKET = os.getenv("CUSTOM_DOCKER_SOCKET")
         client = docker.DockerClient(base_url=CUSTOM_DOCKER_SOCKET)
         return client.ping()
     except Exception:
@@ -70,34 +78,73 @@ public class App {
 }
 """
 
-ORIGINAL_DOCKERFILE = "FROM maven:3.9-eclipse-temurin-11-focal"
+MAVEN_BASE_IMAGE = "maven:3.9-eclipse-temurin-11-focal"
+GRADLE_BASE_IMAGE = "gradle:8.5-jdk11-focal"
+ORIGINAL_DOCKERFILE = f"FROM {MAVEN_BASE_IMAGE}"
+# Base image of the long-running containers used to compile the projects of each build system
+BUILD_SYSTEM_IMAGES = {
+    "maven": MAVEN_BASE_IMAGE,
+    "gradle": GRADLE_BASE_IMAGE,
+}
+# Memory-backed directory (if available) in which the test projects are created
+SCRATCH_ROOT = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# Projects compiled by the integration tests: name -> (files, build system)
+INTEGRATION_PROJECTS = {
+    "maven_success": ({
+        "pom.xml": MAVEN_SUCCESS_POM,
+        "src/main/java/com/example/App.java": JAVA_SUCCESS_CLASS,
+    }, "maven"),
+    "maven_failure": ({
+        "pom.xml": MAVEN_SUCCESS_POM,
+        "src/main/java/com/example/App.java": JAVA_FAILURE_CLASS,  # Has syntax error
+    }, "maven"),
+    "gradle_success": ({
+        "build.gradle": GRADLE_SUCCESS_BUILD,
+        "src/main/java/com/example/App.java": JAVA_SUCCESS_CLASS,
+    }, "gradle"),
+}
 
 
-class TestCompilationRunner(unittest.TestCase):
+def _create_project_structure(base_path, files):
+    """Helper to create files and directories for a test project (the files are written concurrently)."""
+    full_paths = {pathlib.Path(base_path) / file_path: content for file_path, content in files.items()}
+    for directory in {full_path.parent for full_path in full_paths}:
+        directory.mkdir(parents=True, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda item: item[0].write_text(item[1]), full_paths.items()))
 
-    def setUp(self):
-        """Set up a temporary directory for each test."""
-        self.test_dir = tempfile.mkdtemp()
 
-    def tearDown(self):
-        """Clean up the temporary directory after each test."""
-        shutil.rmtree(self.test_dir)
+class TestCompilationRunner(unittest.TestCase):
 
-    def _create_project_structure(self, base_path, files):
-        """Helper to create files and directories for a test project."""
-        for file_path, content in files.items():
-            full_path = pathlib.Path(base_path) / file_path
-            full_path.parent.mkdir(parents=True, exist_ok=True)
-            full_path.write_text(content)
+    @classmethod
+    def setUpClass(cls):
+        """
+        Create the scratch directory shared by the tests and mock the Docker client so that the tests do not ping the
+        Docker daemon (the integration tests use the real client in TestCompilationRunnerIntegration). Both are undone
+        by class cleanups, which also run if the setup fails.
+        """
+        mock_client = MagicMock()
+        mock_client.ping.return_value = True
+        cls._docker_patch = patch('docker.DockerClient', return_value=mock_client)
+        cls._docker_patch.start()
+        cls.addClassCleanup(cls._docker_patch.stop)
+        # Read-only scratch directory shared by the initialization and extraction tests
+        cls._ro_dir = tempfile.mkdtemp(dir=SCRATCH_ROOT)
+        cls.addClassCleanup(shutil.rmtree, cls._ro_dir)
+        _create_project_structure(cls._ro_dir, {
+            "project/.keep": "",
+            "DockerfileMR": ORIGINAL_DOCKERFILE,
+            "DockerfileWithArgs": "ARG version=11\n# Some comment\nFROM maven:3.9-jdk-11\nCOPY . .",
+            "DockerfileNoFrom": "COPY . .",
+        })
 
     # --- Initialization and Validation Tests ---
 
     def test_init_success(self):
         """Test successful initialization with valid paths."""
-        project_path = pathlib.Path(self.test_dir) / "project"
-        project_path.mkdir()
-        dockerfile_path = pathlib.Path(self.test_dir) / "DockerfileMR"
-        dockerfile_path.write_text(ORIGINAL_DOCKERFILE)
+        project_path = pathlib.Path(self._ro_dir) / "project"
+        dockerfile_path = pathlib.Path(self._ro_dir) / "DockerfileMR"
 
         try:
             node = CompilationRunner(str(project_path), str(dockerfile_path))
@@ -107,14 +154,13 @@ class TestCompilationRunner(unittest.TestCase):
 
     def test_init_invalid_project_path(self):
         """Test initialization fails with a non-existent project path."""
-        dockerfile_path = pathlib.Path(self.test_dir) / "DockerfileMR"
-        dockerfile_path.touch()
+        dockerfile_path = pathlib.Path(self._ro_dir) / "DockerfileMR"
         with self.assertRaisesRegex(ValueError, "Project path does not exist"):
             CompilationRunner("/non/existent/path", str(dockerfile_path))
 
     def test_init_invalid_dockerfile_path(self):
         """Test initialization fails with a non-existent Dockerfile path."""
-        project_path = pathlib.Path(self.test_dir)
+        project_path = pathlib.Path(self._ro_dir)
         with self.assertRaisesRegex(ValueError, "Original Dockerfile path does not exist"):
             CompilationRunner(str(project_path), "/non/existent/Dockerfile")
 
@@ -125,10 +171,8 @@ class TestCompilationRunner(unittest.TestCase):
         mock_client.ping.side_effect = docker.errors.APIError("Docker not running")
         mock_from_env.return_value = mock_client
 
-        project_path = pathlib.Path(self.test_dir)
-        project_path.mkdir(exist_ok=True)
-        dockerfile_path = pathlib.Path(self.test_dir) / "DockerfileMR"
-        dockerfile_path.touch()
+        project_path = pathlib.Path(self._ro_dir)
+        dockerfile_path = pathlib.Path(self._ro_dir) / "DockerfileMR"
 
         with self.assertRaisesRegex(RuntimeError, "Could not connect to Docker daemon"):
             CompilationRunner(str(project_path), str(dockerfile_path))
@@ -137,71 +181,134 @@ class TestCompilationRunner(unittest.TestCase):
 
     def test_extract_base_image(self):
         """Test that the FROM line is correctly extracted from a Dockerfile."""
-        dockerfile_path = pathlib.Path(self.test_dir) / "DockerfileMR"
-        dockerfile_path.write_text("ARG version=11\n# Some comment\nFROM maven:3.9-jdk-11\nCOPY . .")
-        node = CompilationRunner(self.test_dir, str(dockerfile_path))
+        dockerfile_path = pathlib.Path(self._ro_dir) / "DockerfileWithArgs"
+        node = CompilationRunner(self._ro_dir, str(dockerfile_path))
         base_image = node._extract_base_image()
         self.assertEqual(base_image, "FROM maven:3.9-jdk-11")
 
     def test_extract_base_image_not_found(self):
         """Test that an error is raised if no FROM line is found."""
-        dockerfile_path = pathlib.Path(self.test_dir) / "DockerfileMR"
-        dockerfile_path.write_text("COPY . .")
-        node = CompilationRunner(self.test_dir, str(dockerfile_path))
+        dockerfile_path = pathlib.Path(self._ro_dir) / "DockerfileNoFrom"
+        node = CompilationRunner(self._ro_dir, str(dockerfile_path))
         with self.assertRaisesRegex(ValueError, "Could not find a 'FROM' instruction"):
             node._extract_base_image()
 
+
+class TestCompilationRunnerOneShot(unittest.TestCase):
+
+    def setUp(self):
+        """Mock the microservice Docker wrapper so that the one-time container is never actually run."""
+        self.container = MagicMock()
+        self.container.wait.return_value = {"StatusCode": 0}
+        self.container.logs.return_value = b"BUILD SUCCESS\n"
+        self.ms_docker = MagicMock(persistent_container=False, timeout_seconds=42)
+        self.ms_docker.run_container.return_value = self.container
+
+    def test_compile_project_success(self):
+        """Test that the image runs the selected command and the container is waited for and removed."""
+        runner = CompilationRunner(self.ms_docker, "maven", auto_cleanup_container=False)
+        success, logs = runner.compile_project(debug_mode=False, with_tests=True)
+        self.assertTrue(success)
+        self.assertEqual(logs, "BUILD SUCCESS")
+        self.ms_docker.build_image.assert_called_once_with(
+            'CMD [ "mvn", "clean", "test-compile", "-B", "-DskipTests" ]')
+        self.ms_docker.run_container.assert_called_once_with()
+        self.container.wait.assert_called_once_with(timeout=42)
+        self.container.remove.assert_called_once_with(force=True)
+        self.ms_docker.cleanup.assert_not_called()
+
+    def test_compile_project_failure(self):
+        """Test that a non-zero exit code is reported with the container logs."""
+        self.container.wait.return_value = {"StatusCode": 1}
+        self.container.logs.return_value = b"[ERROR] cannot find symbol\n"
+        runner = CompilationRunner(self.ms_docker, "gradle")
+        success, logs = runner.compile_project(debug_mode=False)
+        self.assertFalse(success)
+        self.assertTrue(logs.startswith("Compilation failed with exit code 1."))
+        self.assertIn("[ERROR] cannot find symbol", logs)
+        self.container.remove.assert_called_once_with(force=True)
+        self.ms_docker.cleanup.assert_called_once_with(False)
+
+    def test_compile_project_timeout_removes_container(self):
+        """Test that the container is removed even if waiting for it times out."""
+        self.container.wait.side_effect = docker.errors.APIError("Read timed out")
+        runner = CompilationRunner(self.ms_docker, "maven")
+        success, logs = runner.compile_project()
+        self.assertFalse(success)
+        self.assertIn("Read timed out", logs)
+        self.container.remove.assert_called_once_with(force=True)
+
+
+@unittest.skipUnless(is_docker_running(), "Docker daemon is not running")
+class TestCompilationRunnerIntegration(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Pull the base images of the integration tests once (in parallel) so the builds use the local cache, start one
+        long-running container per project with the project mounted, then start compiling the integration test
+        projects concurrently through CompilationRunner in these persistent containers (no image is built for the
+        tests). Every resource is registered for cleanup as soon as it is created so a failing setup does not leak it.
+        """
+        cls._compilations = {}
+        client = docker.DockerClient(base_url=CUSTOM_DOCKER_SOCKET)
+        cls.addClassCleanup(client.close)
+        try:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                list(executor.map(client.images.pull, BUILD_SYSTEM_IMAGES.values()))
+        except docker.errors.DockerException:
+            # The images will be pulled when the containers are started
+            pass
+        cls._integration_dir = tempfile.mkdtemp(dir=SCRATCH_ROOT)
+        cls.addClassCleanup(shutil.rmtree, cls._integration_dir)
+        runners = {}
+        for name, (files, build_system) in INTEGRATION_PROJECTS.items():
+            project_path = pathlib.Path(cls._integration_dir) / name
+            _create_project_structure(project_path, files)
+            dockerfile_path = pathlib.Path(cls._integration_dir) / f"Dockerfile-{name}"
+            dockerfile_path.write_text(f"FROM {BUILD_SYSTEM_IMAGES[build_system]}")
+            microservice = SimpleNamespace(name=name, directory_path=str(project_path))
+            ms_docker = MicroserviceDocker("monomorph-test", microservice, str(dockerfile_path), build_system,
+                                           persistent_container=True, docker_client=client)
+            # The base image stands in for the validation image so that the runner uses the warm container as is
+            client.images.get(BUILD_SYSTEM_IMAGES[build_system]).tag(ms_docker.image_tag)
+            cls.addClassCleanup(client.images.remove, ms_docker.image_tag)
+            container = client.containers.run(
+                ms_docker.image_tag, command="sleep infinity", detach=True, name=ms_docker.container_name,
+                working_dir=DEFAULT_DOCKER_WORKDIR,
+                volumes={str(project_path): {"bind": DEFAULT_DOCKER_WORKDIR, "mode": "rw"}}
+            )
+            cls.addClassCleanup(container.remove, force=True)
+            # The build outputs are owned by the container's user so they are removed from within the container
+            cls.addClassCleanup(container.exec_run, ["sh", "-c", f"rm -rf {DEFAULT_DOCKER_WORKDIR}/*"])
+            runners[name] = CompilationRunner(ms_docker, build_system, auto_cleanup_container=False)
+        cls._executor = ThreadPoolExecutor(max_workers=len(INTEGRATION_PROJECTS))
+        cls.addClassCleanup(cls._executor.shutdown, wait=True)
+        for name, runner in runners.items():
+            cls._compilations[name] = cls._executor.submit(runner.compile_project, debug_mode=False)
+
     # --- Full Integration Tests ---
+    # The projects are compiled concurrently in setUpClass, each test only checks the outcome of its compilation
 
-    @unittest.skipUnless(is_docker_running(), "Docker daemon is not running")
     def test_compile_project_maven_success(self):
         """Test a full, successful compilation of a Maven project."""
-        project_path = pathlib.Path(self.test_dir)
-        files = {
-            "pom.xml": MAVEN_SUCCESS_POM,
-            "src/main/java/com/example/App.java": JAVA_SUCCESS_CLASS,
-            "DockerfileMR": ORIGINAL_DOCKERFILE,
-        }
-        self._create_project_structure(project_path, files)
-
-        node = CompilationRunner(str(project_path), str(project_path / "DockerfileMR"), build_system="maven")
-        success, logs = node.compile_project()
+        success, logs = self._compilations["maven_success"].result()
 
         self.assertTrue(success)
         self.assertIn("BUILD SUCCESS", logs)
 
-    @unittest.skipUnless(is_docker_running(), "Docker daemon is not running")
     def test_compile_project_maven_failure(self):
         """Test a full, failing compilation of a Maven project."""
-        project_path = pathlib.Path(self.test_dir)
-        files = {
-            "pom.xml": MAVEN_SUCCESS_POM,
-            "src/main/java/com/example/App.java": JAVA_FAILURE_CLASS,  # Has syntax error
-            "DockerfileMR": ORIGINAL_DOCKERFILE,
-        }
-        self._create_project_structure(project_path, files)
-
-        node = CompilationRunner(str(project_path), str(project_path / "DockerfileMR"), build_system="maven")
-        success, logs = node.compile_project()
+        success, logs = self._compilations["maven_failure"].result()
 
         self.assertFalse(success)
         self.assertIn("BUILD FAILURE", logs)
         self.assertIn("Compilation failed", logs)  # Check for specific compiler output
         self.assertIn("';' expected", logs)
 
-    @unittest.skipUnless(is_docker_running(), "Docker daemon is not running")
     def test_compile_project_gradle_success(self):
         """Test a full, successful compilation of a Gradle project."""
-        project_path = pathlib.Path(self.test_dir)
-        files = {
-            "build.gradle": GRADLE_SUCCESS_BUILD,
-            "src/main/java/com/example/App.java": JAVA_SUCCESS_CLASS,
-            "DockerfileMR": "FROM gradle:8.5-jdk11-focal",  # Use a Gradle base image
-        }
-        self._create_project_structure(project_path, files)
-
-        node = CompilationRunner(str(project_path), str(project_path / "DockerfileMR"), build_system="gradle")
-        success, logs = node.compile_project()
+        success, logs = self._compilations["gradle_success"].result()
 
         self.assertTrue(success)
         self.assertIn("BUILD SUCCESSFUL", logs)
@@ -1,89 +1,99 @@
 import unittest
 import os
-import json
+import functools
+import itertools
 
+import numpy as np
 import pandas as pd
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
 
 from monomorph.analysis.json import JsonModel
 from monomorph.models import UpdatedDecomposition
 from monomorph.planning.dependencies import DependencyDetector
 
 
+# expected class boundaries of the test application
+_CLASS_ORDER = ["Library", "Book", "User", "ReturnService", "NotificationService"]
+_EXPECTED_CLASS_MATRIX = np.array([
+    [0, 0, 1, 0, 0],
+    [0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0],
+    [1, 1, 0, 0, 0],
+    [0, 0, 1, 0, 0]], dtype=bool)
+_EXPECTED_CLASS_BOUNDARIES = pd.DataFrame(_EXPECTED_CLASS_MATRIX, columns=_CLASS_ORDER, index=_CLASS_ORDER)
+# expected new APIs of the test application
+_EXPECTED_CLASS_APIS = frozenset({'com.example.library.models.Book',
+                                  'com.example.library.models.User',
+                                  'com.example.library.Library'})
+_EXPECTED_METHOD_APIS = frozenset({'com.example.library.models.Book::setBorrowed(boolean)',
+                                   'com.example.library.models.Book::getTitle()',
+                                   'com.example.library.models.Book::isBorrowed()',
+                                   'com.example.library.models.User::getName()',
+                                   'com.example.library.models.User::getId()',
+                                   'com.example.library.Library::findBookById(java.lang.String)',
+                                   'com.example.library.Library::findUserById(java.lang.String)'})
+
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@functools.lru_cache(maxsize=1)
+def _load_fixture():
+    """Load the test application's decomposition and model (only parsed once per test session)."""
+    # define the app name
+    app_name = "example-project-1"
+    analysis_data_path = os.path.join(TEST_DIR, "data", "analysis", app_name)
+    decomposition_file = os.path.join(TEST_DIR, "data", "decompositions", app_name, "manual", "decompositions.json")
+    # load the data (orjson is used for decoding if it is available)
+    with open(decomposition_file, "rb") as f:
+        decomposition_dict = _json.loads(f.read())[0]
+    with open(os.path.join(analysis_data_path, "typeData.json"), "rb") as f:
+        type_data = _json.loads(f.read())
+    with open(os.path.join(analysis_data_path, "methodData.json"), "rb") as f:
+        method_data = _json.loads(f.read())
+    # preprocess the data (the spans only appear on the classes, methods and invocations so only these are visited)
+    for value in type_data["classes"]:
+        value.pop("span", None)
+    for method in method_data["methods"]:
+        method.pop("span", None)
+        for invocation in itertools.chain(method["localInvocations"], method["invocations"]):
+            invocation.pop("span", None)
+    # initialize the classes
+    model = JsonModel(app_name, type_data, method_data)
+    decomposition = UpdatedDecomposition.from_monoembed(decomposition_dict, app_name)
+    return decomposition, model
+
+
 class TestDependencyDetector(unittest.TestCase):
-    TEST_DIR = os.path.dirname(os.path.abspath(__file__))
 
-    def _prepare_for_test(self):
-        # define the app name
-        app_name = "example-project-1"
-        analysis_data_path = os.path.join(self.TEST_DIR, "data", "analysis", app_name)
-        decomposition_file = os.path.join(self.TEST_DIR, "data", "decompositions", app_name, "manual",
-                                          "decompositions.json")
-        # load the data
-        with open(decomposition_file, "r") as f:
-            decomposition_dict = json.load(f)[0]
-        with open(os.path.join(analysis_data_path, "typeData.json"), "r") as f:
-            type_data = json.load(f)
-        with open(os.path.join(analysis_data_path, "methodData.json"), "r") as f:
-            method_data = json.load(f)
-        # preprocess the data
-        type_data["classes"] = [{k: v for k, v in value.items() if k not in ["span"]} for value in type_data["classes"]]
-        method_data["methods"] = [{k: v for k, v in value.items() if k not in ["span"]} for value in method_data["methods"]]
-        for method in method_data["methods"]:
-            for key in ["localInvocations", "invocations"]:
-                for invocation in method[key]:
-                    if "span" in invocation:
-                        invocation.pop("span")
-        # initialize the classes
-        model = JsonModel(app_name, type_data, method_data)
-        decomposition = UpdatedDecomposition.from_monoembed(decomposition_dict, app_name)
-        return decomposition, model
+    @classmethod
+    def setUpClass(cls):
+        # the fixtures are only read by the detector, so they are shared by all the tests
+        cls._decomposition, cls._model = _load_fixture()
 
     def test_find_boundaries(self):
-        decomposition, model = self._prepare_for_test()
-        dd = DependencyDetector(decomposition, model)
+        dd = DependencyDetector(self._decomposition, self._model)
         # get the output
         class_out, method_out = dd.find_boundaries()
-        # expected output
-        class_matrix = [
-            [0, 0, 1, 0, 0],
-            [0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 0],
-            [1, 1, 0, 0, 0],
-            [0, 0, 1, 0, 0]]
-        class_order = ["Library", "Book", "User", "ReturnService", "NotificationService"]
-        class_df = pd.DataFrame(class_matrix, columns=class_order, index=class_order)
-        class_df = class_df > 0
         # postprocess the output
         class_out.columns = [c.split(".")[-1] for c in class_out.columns]
         class_out.index = [c.split(".")[-1] for c in class_out.index]
-        class_out = class_out.loc[class_order, class_order]
-        class_out = class_out > 0
         # verify the output
-        self.assertTrue((class_out == class_df).all().all())
+        pd.testing.assert_frame_equal(class_out.loc[_CLASS_ORDER, _CLASS_ORDER] > 0, _EXPECTED_CLASS_BOUNDARIES)
 
     def test_find_new_apis(self):
-        decomposition, model = self._prepare_for_test()
-        dd = DependencyDetector(decomposition, model)
+        dd = DependencyDetector(self._decomposition, self._model)
         # get the output
         class_apis, method_apis, _ = dd.find_new_apis()
-        # expected output
-        expected_class_apis = {'com.example.library.models.Book',
-                               'com.example.library.models.User',
-                               'com.example.library.Library'}
-        expected_method_apis = ['com.example.library.models.Book::setBorrowed(boolean)',
-                                'com.example.library.models.Book::getTitle()',
-                                'com.example.library.models.Book::isBorrowed()',
-                                'com.example.library.models.User::getName()',
-                                'com.example.library.models.User::getId()',
-                                'com.example.library.Library::findBookById(java.lang.String)',
-                                'com.example.library.Library::findUserById(java.lang.String)']
         # verify the output
-        self.assertEqual(set(class_apis), expected_class_apis, "Detected Class APIs are not as expected")
-        self.assertEqual(set(method_apis), set(expected_method_apis), "Detected Method APIs are not as expected")
+        self.assertSetEqual(set(class_apis), _EXPECTED_CLASS_APIS, "Detected Class APIs are not as expected")
+        self.assertSetEqual(set(method_apis), _EXPECTED_METHOD_APIS, "Detected Method APIs are not as expected")
 
     def test_find_new_dtos(self):
-        decomposition, model = self._prepare_for_test()
-        dd = DependencyDetector(decomposition, model)
+        dd = DependencyDetector(self._decomposition, self._model)
         # get the output
         dtos = dd.find_new_dtos()
         # expected output
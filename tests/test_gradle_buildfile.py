@@ -1,6 +1,6 @@
 import unittest
 import os
-import shutil
+import pathlib
 import tempfile
 import logging
 
@@ -10,37 +10,46 @@ from monomorph.assembly.dependency.gradle import (GradleBuildFile, GRADLE_PROTOB
 
 class TestGradleBuildFileRegex(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        """
+        Create a temporary directory shared by the tests (the files are prefixed by the test names), it is removed
+        once the tests are done.
+        """
+        temp_dir = tempfile.TemporaryDirectory()
+        cls.test_dir = temp_dir.name
+        cls.addClassCleanup(temp_dir.cleanup)
+
     def setUp(self):
-        """Create a temporary directory for test files."""
-        self.test_dir = tempfile.mkdtemp()
         # Suppress logging during tests unless debugging
         logging.disable(logging.CRITICAL)
         self.maxDiff = None  # Show full diff on assertion failure
 
     def tearDown(self):
-        """Remove the temporary directory after tests."""
-        shutil.rmtree(self.test_dir)
         logging.disable(logging.NOTSET)
 
+    def _test_path(self, filename: str) -> str:
+        """Helper to get the path of a file of the current test in the temp dir."""
+        return os.path.join(self.test_dir, f"{self._testMethodName}_{filename}")
+
     def _create_dummy_file(self, filename: str, content: str) -> str:
         """Helper to create a file with given content in the temp dir."""
-        filepath = os.path.join(self.test_dir, filename)
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(content)
+        filepath = self._test_path(filename)
+        pathlib.Path(filepath).write_text(content, encoding="utf-8")
         return filepath
 
     def _read_file_content(self, filepath: str) -> str:
-        """Helper to read file content."""
-        if not os.path.exists(filepath):
-            raise FileNotFoundError(f"File not found: {filepath}")
-        with open(filepath, "r", encoding="utf-8") as f:
-            return f.read()
+        """Helper to read file content (a missing file fails the test)."""
+        try:
+            return pathlib.Path(filepath).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            self.fail(f"File not found: {filepath}")
 
     # --- Test Cases ---
 
     def test_parse_file_not_found(self):
         """Test parsing a non-existent file."""
-        non_existent_file = os.path.join(self.test_dir, "non_existent.gradle")
+        non_existent_file = self._test_path("non_existent.gradle")
         gradle_file = GradleBuildFile(non_existent_file, "11")
         with self.assertRaises(FileNotFoundError):
             gradle_file.parse()
@@ -91,7 +100,7 @@ repositories {
 }
 """
         filepath = self._create_dummy_file("build_add_dep_noblock.gradle", content)
-        output_path = os.path.join(self.test_dir, "build_add_dep_noblock_out.gradle")
+        output_path = self._test_path("build_add_dep_noblock_out.gradle")
         gradle_file = GradleBuildFile(filepath, "11", output_path=output_path)
         gradle_file.parse()
 
@@ -119,7 +128,7 @@ dependencies {
 }
 """
         filepath = self._create_dummy_file("build_add_dep_empty.gradle", content)
-        output_path = os.path.join(self.test_dir, "build_add_dep_empty_out.gradle")
+        output_path = self._test_path("build_add_dep_empty_out.gradle")
         gradle_file = GradleBuildFile(filepath, "11", output_path=output_path)
         gradle_file.parse()
 
@@ -148,7 +157,7 @@ dependencies {
 } // Closing brace with comment
 """
         filepath = self._create_dummy_file("build_add_dep_content.gradle", content)
-        output_path = os.path.join(self.test_dir, "build_add_dep_content_out.gradle")
+        output_path = self._test_path("build_add_dep_content_out.gradle")
         gradle_file = GradleBuildFile(filepath, "11", output_path=output_path)
         gradle_file.parse()
 
@@ -196,7 +205,7 @@ dependencies {{
 }} // Closing brace with comment
 """
         filepath = self._create_dummy_file("build_add_dep_content.gradle", content)
-        output_path = os.path.join(self.test_dir, "build_add_dep_content_out.gradle")
+        output_path = self._test_path("build_add_dep_content_out.gradle")
         gradle_file = GradleBuildFile(filepath, "11", output_path=output_path)
         gradle_file.parse()
 
@@ -228,7 +237,7 @@ dependencies {
 }
 """
         filepath = self._create_dummy_file("build_add_dep_exists.gradle", content)
-        output_path = os.path.join(self.test_dir, "build_add_dep_exists_out.gradle")
+        output_path = self._test_path("build_add_dep_exists_out.gradle")
         gradle_file = GradleBuildFile(filepath, "11", output_path=output_path)
         gradle_file.parse()
 
@@ -273,7 +282,7 @@ plugins {
 repositories { mavenCentral() }
 """
         filepath = self._create_dummy_file("build_add_plugin_noblock.gradle", content)
-        output_path = os.path.join(self.test_dir, "build_add_plugin_noblock_out.gradle")
+        output_path = self._test_path("build_add_plugin_noblock_out.gradle")
         gradle_file = GradleBuildFile(filepath, "11", output_path=output_path)
         gradle_file.parse()
 
@@ -302,7 +311,7 @@ plugins {
 }
 """
         filepath = self._create_dummy_file("build_add_plugin_empty.gradle", content)
-        output_path = os.path.join(self.test_dir, "build_add_plugin_empty_out.gradle")
+        output_path = self._test_path("build_add_plugin_empty_out.gradle")
         gradle_file = GradleBuildFile(filepath, "11", output_path=output_path)
         gradle_file.parse()
 
@@ -328,7 +337,7 @@ plugins {
 }
 """
         filepath = self._create_dummy_file("build_add_plugin_exists.gradle", content)
-        output_path = os.path.join(self.test_dir, "build_add_plugin_exists_out.gradle")
+        output_path = self._test_path("build_add_plugin_exists_out.gradle")
         gradle_file = GradleBuildFile(filepath, "11", output_path=output_path)
         gradle_file.parse()
 
@@ -349,7 +358,7 @@ plugins {{
 dependencies {{}}
 """
         filepath = self._create_dummy_file("build_add_proto_block.gradle", content)
-        output_path = os.path.join(self.test_dir, "build_add_proto_block_out.gradle")
+        output_path = self._test_path("build_add_proto_block_out.gradle")
         gradle_file = GradleBuildFile(filepath, "11", output_path=output_path)
         gradle_file.parse()
 
@@ -380,7 +389,7 @@ protobuf {{
 dependencies {{}}
 """
         filepath = self._create_dummy_file("build_add_proto_block_exists.gradle", content)
-        output_path = os.path.join(self.test_dir, "build_add_proto_block_exists_out.gradle")
+        output_path = self._test_path("build_add_proto_block_exists_out.gradle")
         gradle_file = GradleBuildFile(filepath, "11", output_path=output_path)
         gradle_file.parse()
 
@@ -399,7 +408,7 @@ plugins {
 }
 """
         filepath = self._create_dummy_file("build_add_proto_block_noplugin.gradle", content)
-        output_path = os.path.join(self.test_dir, "build_add_proto_block_noplugin_out.gradle")
+        output_path = self._test_path("build_add_proto_block_noplugin_out.gradle")
         gradle_file = GradleBuildFile(filepath, "11", output_path=output_path)
         gradle_file.parse()
 
@@ -414,7 +423,7 @@ plugins {
         """Test save when no modifications were made."""
         content = "plugins { id 'java' }"
         filepath = self._create_dummy_file("build_save_nochange.gradle", content)
-        output_path = os.path.join(self.test_dir, "build_save_nochange_out.gradle")
+        output_path = self._test_path("build_save_nochange_out.gradle")
         gradle_file = GradleBuildFile(filepath, "11", output_path=output_path)
         gradle_file.parse()
         # No modifications
@@ -1,7 +1,4 @@
 import unittest
-import os
-import shutil
-import tempfile
 import logging
 import re
 
@@ -13,117 +10,65 @@ from monomorph.assembly.dependency.maven import (OS_MAVEN_PLUGIN_VERSION, PROTOB
 from monomorph.assembly.dependency.dependency import GrpcDependencyHandler
 
 
+def _normalize(content: str) -> str:
+    """Strip the lines of a build file and drop the blank ones."""
+    return "\n".join(filter(None, map(str.strip, content.splitlines())))
+
+
 class TestGrpcDependencyHandler(unittest.TestCase):
 
     def setUp(self):
-        """Create a temporary directory for test files."""
-        self.test_dir = tempfile.mkdtemp()
         # Suppress logging during tests unless debugging
         logging.disable(logging.CRITICAL)
         self.maxDiff = None  # Show full diff on assertion failure
 
     def tearDown(self):
-        """Remove the temporary directory after tests."""
-        shutil.rmtree(self.test_dir)
         logging.disable(logging.NOTSET)
 
-    def _create_dummy_file(self, filename: str, content: str) -> str:
-        """Helper to create a file with given content in the temp dir."""
-        filepath = os.path.join(self.test_dir, filename)
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(content)
-        return filepath
-
-    def _read_file_content(self, filepath: str) -> str:
-        """Helper to read file content."""
-        if not os.path.exists(filepath):
-            raise FileNotFoundError(f"File not found: {filepath}")
-        with open(filepath, "r", encoding="utf-8") as f:
-            return f.read()
+    def _check_handler_output(self, source_text: str, java_version: str, build_tool: str, mode: str,
+                              expected_content: str):
+        """Helper to add the dependencies to a build file in memory and compare it to the normalized expected one."""
+        dependency_handler = GrpcDependencyHandler.from_text(source_text, java_version, build_tool=build_tool,
+                                                             mode=mode)
+        dependency_handler.add_dependencies()
+        self.assertTrue(dependency_handler._added_dependencies)
+        # Check the output content
+        output_content = dependency_handler.output_text
+        self.assertIsNotNone(output_content)
+        self.assertEqual(expected_content, _normalize(output_content))
 
     # --- Test Cases ---
+    # The build files are updated in memory so the tests do not go through the disk
 
     def test_gradle(self):
         """Test full integration of adding dependencies and plugins with gradle."""
-        filepath = self._create_dummy_file("build_full_integration.gradle", FULL_EXAMPLE_GRADLE)
-        output_path = os.path.join(self.test_dir, "build_full_integration_out.gradle")
-        dependency_handler = GrpcDependencyHandler(filepath, "17", output_path=output_path,
-                                                   build_tool="gradle")
-        dependency_handler.add_dependencies()
-        self.assertTrue(dependency_handler._added_dependencies)
-        # Check the output file
-        self.assertTrue(os.path.exists(output_path))
-        output_content = self._read_file_content(output_path)
-        stripped_output_lines = [line.strip() for line in output_content.split("\n") if line.strip()]
-        stripped_expected_lines = [line.strip() for line in EXPECTED_FULL_EXAMPLE_GRADLE.split("\n") if line.strip()]
-        # self.assertListEqual(stripped_output_lines, stripped_expected_lines)
-        self.assertEqual("\n".join(stripped_expected_lines), "\n".join(stripped_output_lines))
+        self._check_handler_output(FULL_EXAMPLE_GRADLE, "17", "gradle", "client", _EXPECTED_FULL_EXAMPLE_GRADLE_NORM)
 
     def test_maven(self):
         """Test full integration of adding dependencies and plugins with maven."""
-        filepath = self._create_dummy_file("pom_full_integration.xml", FULL_EXAMPLE_POM)
-        output_path = os.path.join(self.test_dir, "pom_full_integration_out.xml")
-        dependency_handler = GrpcDependencyHandler(filepath, "11", output_path=output_path,
-                                                   build_tool="maven")
-        dependency_handler.add_dependencies()
-        self.assertTrue(dependency_handler._added_dependencies)
-        # Check the output file
-        self.assertTrue(os.path.exists(output_path))
-        output_content = self._read_file_content(output_path)
-        stripped_output_lines = [line.strip() for line in output_content.split("\n") if line.strip()]
-        stripped_expected_lines = [line.strip() for line in EXPECTED_FULL_EXAMPLE_POM.split("\n") if line.strip()]
-        self.assertEqual("\n".join(stripped_expected_lines), "\n".join(stripped_output_lines))
+        self._check_handler_output(FULL_EXAMPLE_POM, "11", "maven", "client", _EXPECTED_FULL_EXAMPLE_POM_NORM)
 
     def test_gradle_server_with_existing_dep(self):
         """Test full integration of adding dependencies and plugins with gradle when a dependency already exists."""
-        filepath = self._create_dummy_file("build_full_integration.gradle", FULL_EXAMPLE_GRADLE)
-        output_path = os.path.join(self.test_dir, "build_full_integration_out.gradle")
-        dependency_handler = GrpcDependencyHandler(filepath, "17", output_path=output_path,
-                                                   build_tool="gradle", mode="server")
-        dependency_handler.add_dependencies()
-        self.assertTrue(dependency_handler._added_dependencies)
-        # Check the output file
-        self.assertTrue(os.path.exists(output_path))
-        output_content = self._read_file_content(output_path)
-        stripped_output_lines = [line.strip() for line in output_content.split("\n") if line.strip()]
-        stripped_expected_lines = [line.strip() for line in EXPECTED_FULL_EXAMPLE_GRADLE_SERVER.split("\n") if line.strip()]
-        # self.assertListEqual(stripped_output_lines, stripped_expected_lines)
         # Since the gradle project already has caffeine, the dependency should not be added again
-        self.assertEqual("\n".join(stripped_expected_lines), "\n".join(stripped_output_lines))
+        self._check_handler_output(FULL_EXAMPLE_GRADLE, "17", "gradle", "server",
+                                   _EXPECTED_FULL_EXAMPLE_GRADLE_SERVER_NORM)
 
     def test_gradle_server(self):
         """Test full integration of adding dependencies and plugins with gradle when using server mode."""
-        FULL_EXAMPLE_GRADLE_WITHOUT_CAFFEINE = re.sub(r"\n\s*runtimeOnly 'com.github.ben-manes.caffeine:caffeine'",
-                                                      "", FULL_EXAMPLE_GRADLE)
-        filepath = self._create_dummy_file("build_full_integration.gradle", FULL_EXAMPLE_GRADLE_WITHOUT_CAFFEINE)
-        output_path = os.path.join(self.test_dir, "build_full_integration_out.gradle")
-        dependency_handler = GrpcDependencyHandler(filepath, "17", output_path=output_path,
-                                                   build_tool="gradle", mode="server")
-        dependency_handler.add_dependencies()
-        self.assertTrue(dependency_handler._added_dependencies)
-        # Check the output file
-        self.assertTrue(os.path.exists(output_path))
-        output_content = self._read_file_content(output_path)
-        stripped_output_lines = [line.strip() for line in output_content.split("\n") if line.strip()]
-        stripped_expected_lines = [line.strip() for line in EXPECTED_FULL_EXAMPLE_GRADLE_SERVER_WITHOUT_CAFFEINE.split("\n") if line.strip()]
-        # self.assertListEqual(stripped_output_lines, stripped_expected_lines)
-        self.assertEqual("\n".join(stripped_expected_lines), "\n".join(stripped_output_lines))
+        self._check_handler_output(FULL_EXAMPLE_GRADLE_WITHOUT_CAFFEINE, "17", "gradle", "server",
+                                   _EXPECTED_FULL_EXAMPLE_GRADLE_SERVER_WITHOUT_CAFFEINE_NORM)
 
     def test_maven_server(self):
         """Test full integration of adding dependencies and plugins with maven when using server mode."""
-        filepath = self._create_dummy_file("pom_full_integration.xml", FULL_EXAMPLE_POM)
-        output_path = os.path.join(self.test_dir, "pom_full_integration_out.xml")
-        dependency_handler = GrpcDependencyHandler(filepath, "11", output_path=output_path,
-                                                   build_tool="maven", mode="server")
+        self._check_handler_output(FULL_EXAMPLE_POM, "11", "maven", "server", _EXPECTED_FULL_EXAMPLE_POM_SERVER_NORM)
+
+    def test_maven_unchanged(self):
+        """Test that the in-memory output is the source content when the build file already has everything."""
+        dependency_handler = GrpcDependencyHandler.from_text(EXPECTED_FULL_EXAMPLE_POM, "11", build_tool="maven")
         dependency_handler.add_dependencies()
-        self.assertTrue(dependency_handler._added_dependencies)
-        # Check the output file
-        self.assertTrue(os.path.exists(output_path))
-        output_content = self._read_file_content(output_path)
-        expected_content = EXPECTED_FULL_EXAMPLE_POM_SERVER.replace("{java_version}", "11")
-        stripped_output_lines = [line.strip() for line in output_content.split("\n") if line.strip()]
-        stripped_expected_lines = [line.strip() for line in expected_content.split("\n") if line.strip()]
-        self.assertEqual("\n".join(stripped_expected_lines), "\n".join(stripped_output_lines))
+        self.assertFalse(dependency_handler.build_file.is_modified)
+        self.assertEqual(EXPECTED_FULL_EXAMPLE_POM, dependency_handler.output_text)
 
 
 
@@ -171,8 +116,12 @@ tasks.named('test') {
   useJUnitPlatform()
 }
 """
+# the example without the caffeine dependency (computed once for the whole test session)
+_CAFFEINE_LINE_REGEX = re.compile(r"\n\s*runtimeOnly 'com.github.ben-manes.caffeine:caffeine'")
+FULL_EXAMPLE_GRADLE_WITHOUT_CAFFEINE = _CAFFEINE_LINE_REGEX.sub("", FULL_EXAMPLE_GRADLE)
 
-EXPECTED_FULL_EXAMPLE_GRADLE = f"""
+# the expected gradle outputs are assembled from the blocks shared by the client and server variants
+_EXPECTED_GRADLE_HEAD = f"""
 plugins {{
   id 'org.springframework.boot' version '3.0.1'
   id 'io.spring.dependency-management' version '1.1.0'
@@ -218,155 +167,46 @@ dependencies {{
   runtimeOnly 'org.springframework.boot:spring-boot-starter-actuator'
   runtimeOnly "org.webjars.npm:bootstrap:${{webjarsBootstrapVersion}}"
   runtimeOnly "org.webjars.npm:font-awesome:${{webjarsFontawesomeVersion}}"
-  runtimeOnly 'com.github.ben-manes.caffeine:caffeine'
-  runtimeOnly 'com.h2database:h2'
-  runtimeOnly 'com.mysql:mysql-connector-j'
-  runtimeOnly 'org.postgresql:postgresql'
-  developmentOnly 'org.springframework.boot:spring-boot-devtools'
-  testImplementation 'org.springframework.boot:spring-boot-starter-test'
-  runtimeOnly 'io.grpc:grpc-netty-shaded:{GRPC_VERSION}'
-  implementation 'io.grpc:grpc-protobuf:{GRPC_VERSION}'
-  implementation 'io.grpc:grpc-stub:{GRPC_VERSION}'
-  implementation 'com.google.protobuf:protobuf-java:{PROTOBUF_VERSION}'
-  compileOnly 'javax.annotation:javax.annotation-api:{ANNOTATION_API_VERSION}'
-}}
-
-tasks.named('test') {{
-  useJUnitPlatform()
-}}
 """
-
-EXPECTED_FULL_EXAMPLE_GRADLE_SERVER = f"""
-plugins {{
-  id 'org.springframework.boot' version '3.0.1'
-  id 'io.spring.dependency-management' version '1.1.0'
-  id 'java'
-  id 'com.google.protobuf' version '{GRADLE_PROTOBUF_PLUGIN_VERSION}'
-}}
-
-protobuf {{
-    protoc {{ artifact = 'com.google.protobuf:protoc:{PROTOBUF_VERSION}' }}
-    plugins {{
-        grpc {{
-            artifact = 'io.grpc:protoc-gen-grpc-java:{GRPC_VERSION}'
-        }}
-    }}
-    generateProtoTasks {{
-        all()*.plugins {{
-            grpc {{}}
-        }}
-    }}
-}}
-
-apply plugin: 'java'
-
-group = 'org.springframework.samples'
-version = '3.0.0'
-sourceCompatibility = '17'
-
-repositories {{
-  mavenCentral()
-}}
-
-ext.webjarsFontawesomeVersion = "4.7.0"
-ext.webjarsBootstrapVersion = "5.1.3"
-
-dependencies {{
-  implementation 'org.springframework.boot:spring-boot-starter-cache'
-  implementation 'org.springframework.boot:spring-boot-starter-data-jpa'
-  implementation 'org.springframework.boot:spring-boot-starter-thymeleaf'
-  implementation 'org.springframework.boot:spring-boot-starter-web'
-  implementation 'org.springframework.boot:spring-boot-starter-validation'
-  implementation 'javax.cache:cache-api'
-  implementation 'jakarta.xml.bind:jakarta.xml.bind-api'
-  runtimeOnly 'org.springframework.boot:spring-boot-starter-actuator'
-  runtimeOnly "org.webjars.npm:bootstrap:${{webjarsBootstrapVersion}}"
-  runtimeOnly "org.webjars.npm:font-awesome:${{webjarsFontawesomeVersion}}"
-  runtimeOnly 'com.github.ben-manes.caffeine:caffeine'
-  runtimeOnly 'com.h2database:h2'
+_GRADLE_SOURCE_CAFFEINE_LINE = "  runtimeOnly 'com.github.ben-manes.caffeine:caffeine'\n"
+_EXPECTED_GRADLE_BASE_DEPENDENCIES = """  runtimeOnly 'com.h2database:h2'
   runtimeOnly 'com.mysql:mysql-connector-j'
   runtimeOnly 'org.postgresql:postgresql'
   developmentOnly 'org.springframework.boot:spring-boot-devtools'
   testImplementation 'org.springframework.boot:spring-boot-starter-test'
-  runtimeOnly 'io.grpc:grpc-netty-shaded:{GRPC_VERSION}'
+"""
+_EXPECTED_GRADLE_GRPC_DEPENDENCIES = f"""  runtimeOnly 'io.grpc:grpc-netty-shaded:{GRPC_VERSION}'
   implementation 'io.grpc:grpc-protobuf:{GRPC_VERSION}'
   implementation 'io.grpc:grpc-stub:{GRPC_VERSION}'
   implementation 'com.google.protobuf:protobuf-java:{PROTOBUF_VERSION}'
   compileOnly 'javax.annotation:javax.annotation-api:{ANNOTATION_API_VERSION}'
-  implementation 'org.mapstruct:mapstruct:{MAPSTRUCT_VERSION}'
-  annotationProcessor 'org.mapstruct:mapstruct-processor:{MAPSTRUCT_VERSION}'
-}}
+"""
+# the server dependencies added after the gRPC ones
+_GRADLE_CAFFEINE_LINE = f"  implementation 'com.github.ben-manes.caffeine:caffeine:{CAFFEINE_VERSION}'\n"
+_GRADLE_MAPSTRUCT_LINES = (f"  implementation 'org.mapstruct:mapstruct:{MAPSTRUCT_VERSION}'\n"
+                           f"  annotationProcessor 'org.mapstruct:mapstruct-processor:{MAPSTRUCT_VERSION}'\n")
+_EXPECTED_GRADLE_TAIL = """}
 
-tasks.named('test') {{
+tasks.named('test') {
   useJUnitPlatform()
-}}
+}
 """
 
-EXPECTED_FULL_EXAMPLE_GRADLE_SERVER_WITHOUT_CAFFEINE = f"""
-plugins {{
-  id 'org.springframework.boot' version '3.0.1'
-  id 'io.spring.dependency-management' version '1.1.0'
-  id 'java'
-  id 'com.google.protobuf' version '{GRADLE_PROTOBUF_PLUGIN_VERSION}'
-}}
-
-protobuf {{
-    protoc {{ artifact = 'com.google.protobuf:protoc:{PROTOBUF_VERSION}' }}
-    plugins {{
-        grpc {{
-            artifact = 'io.grpc:protoc-gen-grpc-java:{GRPC_VERSION}'
-        }}
-    }}
-    generateProtoTasks {{
-        all()*.plugins {{
-            grpc {{}}
-        }}
-    }}
-}}
-
-apply plugin: 'java'
-
-group = 'org.springframework.samples'
-version = '3.0.0'
-sourceCompatibility = '17'
 
-repositories {{
-  mavenCentral()
-}}
+def _build_expected_gradle(*, server: bool, caffeine_in_source: bool = True) -> str:
+    """Assemble the expected gradle output of the handler in client or server mode."""
+    server_dependencies = ""
+    if server:
+        # caffeine is only added when the source does not have it already
+        server_dependencies = ("" if caffeine_in_source else _GRADLE_CAFFEINE_LINE) + _GRADLE_MAPSTRUCT_LINES
+    return "".join((_EXPECTED_GRADLE_HEAD, _GRADLE_SOURCE_CAFFEINE_LINE if caffeine_in_source else "",
+                    _EXPECTED_GRADLE_BASE_DEPENDENCIES, _EXPECTED_GRADLE_GRPC_DEPENDENCIES, server_dependencies,
+                    _EXPECTED_GRADLE_TAIL))
 
-ext.webjarsFontawesomeVersion = "4.7.0"
-ext.webjarsBootstrapVersion = "5.1.3"
 
-dependencies {{
-  implementation 'org.springframework.boot:spring-boot-starter-cache'
-  implementation 'org.springframework.boot:spring-boot-starter-data-jpa'
-  implementation 'org.springframework.boot:spring-boot-starter-thymeleaf'
-  implementation 'org.springframework.boot:spring-boot-starter-web'
-  implementation 'org.springframework.boot:spring-boot-starter-validation'
-  implementation 'javax.cache:cache-api'
-  implementation 'jakarta.xml.bind:jakarta.xml.bind-api'
-  runtimeOnly 'org.springframework.boot:spring-boot-starter-actuator'
-  runtimeOnly "org.webjars.npm:bootstrap:${{webjarsBootstrapVersion}}"
-  runtimeOnly "org.webjars.npm:font-awesome:${{webjarsFontawesomeVersion}}"
-  runtimeOnly 'com.h2database:h2'
-  runtimeOnly 'com.mysql:mysql-connector-j'
-  runtimeOnly 'org.postgresql:postgresql'
-  developmentOnly 'org.springframework.boot:spring-boot-devtools'
-  testImplementation 'org.springframework.boot:spring-boot-starter-test'
-  runtimeOnly 'io.grpc:grpc-netty-shaded:{GRPC_VERSION}'
-  implementation 'io.grpc:grpc-protobuf:{GRPC_VERSION}'
-  implementation 'io.grpc:grpc-stub:{GRPC_VERSION}'
-  implementation 'com.google.protobuf:protobuf-java:{PROTOBUF_VERSION}'
-  compileOnly 'javax.annotation:javax.annotation-api:{ANNOTATION_API_VERSION}'
-  implementation 'com.github.ben-manes.caffeine:caffeine:{CAFFEINE_VERSION}'
-  implementation 'org.mapstruct:mapstruct:{MAPSTRUCT_VERSION}'
-  annotationProcessor 'org.mapstruct:mapstruct-processor:{MAPSTRUCT_VERSION}'
-}}
-
-tasks.named('test') {{
-  useJUnitPlatform()
-}}
-"""
+EXPECTED_FULL_EXAMPLE_GRADLE = _build_expected_gradle(server=False)
+EXPECTED_FULL_EXAMPLE_GRADLE_SERVER = _build_expected_gradle(server=True)
+EXPECTED_FULL_EXAMPLE_GRADLE_SERVER_WITHOUT_CAFFEINE = _build_expected_gradle(server=True, caffeine_in_source=False)
 
 
 FULL_EXAMPLE_POM = """<?xml version='1.0' encoding='utf-8'?>
@@ -452,7 +292,8 @@ FULL_EXAMPLE_POM = """<?xml version='1.0' encoding='utf-8'?>
 </project>
 """
 
-EXPECTED_FULL_EXAMPLE_POM = f"""<?xml version='1.0' encoding='utf-8'?>
+# the expected POM outputs are assembled from the blocks shared by the client and server variants
+_EXPECTED_POM_HEAD = f"""<?xml version='1.0' encoding='utf-8'?>
 <project xmlns="http://maven.apache.org/POM/4.0.0" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:schemaLocation="http://maven.apache.org/POM/4.0.0 http://maven.apache.org/xsd/maven-4.0.0.xsd">
     <modelVersion>4.0.0</modelVersion>
     <groupId>com.example</groupId>
@@ -550,7 +391,8 @@ EXPECTED_FULL_EXAMPLE_POM = f"""<?xml version='1.0' encoding='utf-8'?>
             <version>{ANNOTATION_API_VERSION}</version>
             <scope>provided</scope>
         </dependency>
-    </dependencies>
+"""
+_EXPECTED_POM_BUILD = f"""    </dependencies>
 
     <build>
         <extensions>
@@ -584,110 +426,14 @@ EXPECTED_FULL_EXAMPLE_POM = f"""<?xml version='1.0' encoding='utf-8'?>
                     </execution>
                 </executions>
             </plugin>
-        </plugins>
+"""
+_EXPECTED_POM_TAIL = """        </plugins>
     </build>
 </project>
 """
 
-EXPECTED_FULL_EXAMPLE_POM_SERVER = f"""<?xml version='1.0' encoding='utf-8'?>
-<project xmlns="http://maven.apache.org/POM/4.0.0" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:schemaLocation="http://maven.apache.org/POM/4.0.0 http://maven.apache.org/xsd/maven-4.0.0.xsd">
-    <modelVersion>4.0.0</modelVersion>
-    <groupId>com.example</groupId>
-    <artifactId>spring-boot-jpa-example</artifactId>
-    <version>0.0.1-SNAPSHOT</version>
-    <packaging>jar</packaging>
-    <name>Spring Boot JPA Example</name>
-    <description>A simple Spring Boot application with JPA</description>
-    <parent>
-        <groupId>org.springframework.boot</groupId>
-        <artifactId>spring-boot-starter-parent</artifactId>
-        <version>2.7.18</version>
-        <relativePath /> 
-        <!-- lookup parent from repository -->
-    </parent>
-
-    <properties>
-        <java.version>11</java.version>
-    </properties>
-
-    <dependencies>
-        <!-- Spring Boot Starter for Web -->
-        <dependency>
-            <groupId>org.springframework.boot</groupId>
-            <artifactId>spring-boot-starter-web</artifactId>
-            <version>2.7.18</version>
-        </dependency>
-
-        <!-- Spring Boot Starter for JPA -->
-        <dependency>
-            <groupId>org.springframework.boot</groupId>
-            <artifactId>spring-boot-starter-data-jpa</artifactId>
-            <version>2.7.18</version>
-        </dependency>
-
-        <!-- H2 Database for Development -->
-        <dependency>
-            <groupId>com.h2database</groupId>
-            <artifactId>h2</artifactId>
-            <scope>runtime</scope>
-        </dependency>
-
-        <!-- Lombok for cleaner code (optional) -->
-        <dependency>
-            <groupId>org.projectlombok</groupId>
-            <artifactId>lombok</artifactId>
-            <optional>true</optional>
-        </dependency>
-
-        <!-- Spring Boot Starter Test -->
-        <dependency>
-            <groupId>org.springframework.boot</groupId>
-            <artifactId>spring-boot-starter-test</artifactId>
-            <scope>test</scope>
-        </dependency>
-
-        <!-- javax.persistence dependency -->
-        <dependency>
-            <groupId>javax.persistence</groupId>
-            <artifactId>javax.persistence-api</artifactId>
-            <version>2.2</version>
-        </dependency>
-
-        <!-- JUnit Jupiter dependency -->
-        <dependency>
-            <groupId>org.junit.jupiter</groupId>
-            <artifactId>junit-jupiter</artifactId>
-            <version>5.8.2</version>
-            <scope>test</scope>
-        </dependency>
-        <dependency>
-            <groupId>io.grpc</groupId>
-            <artifactId>grpc-netty-shaded</artifactId>
-            <version>{GRPC_VERSION}</version>
-            <scope>runtime</scope>
-        </dependency>
-        <dependency>
-            <groupId>io.grpc</groupId>
-            <artifactId>grpc-protobuf</artifactId>
-            <version>{GRPC_VERSION}</version>
-        </dependency>
-        <dependency>
-            <groupId>io.grpc</groupId>
-            <artifactId>grpc-stub</artifactId>
-            <version>{GRPC_VERSION}</version>
-        </dependency>
-        <dependency>
-            <groupId>com.google.protobuf</groupId>
-            <artifactId>protobuf-java</artifactId>
-            <version>{PROTOBUF_VERSION}</version>
-        </dependency>
-        <dependency>
-            <groupId>javax.annotation</groupId>
-            <artifactId>javax.annotation-api</artifactId>
-            <version>{ANNOTATION_API_VERSION}</version>
-            <scope>provided</scope>
-        </dependency>
-        <dependency>
+# the server dependencies and compiler plugin added by the handler in server mode
+_POM_SERVER_DEPENDENCIES = f"""        <dependency>
             <groupId>com.github.ben-manes.caffeine</groupId>
             <artifactId>caffeine</artifactId>
             <version>{CAFFEINE_VERSION}</version>
@@ -697,41 +443,8 @@ EXPECTED_FULL_EXAMPLE_POM_SERVER = f"""<?xml version='1.0' encoding='utf-8'?>
             <artifactId>mapstruct</artifactId>
             <version>{MAPSTRUCT_VERSION}</version>
         </dependency>
-    </dependencies>
-
-    <build>
-        <extensions>
-            <extension>
-                <groupId>kr.motd.maven</groupId>
-                <artifactId>os-maven-plugin</artifactId>
-                <version>{OS_MAVEN_PLUGIN_VERSION}</version>
-            </extension>
-        </extensions>
-        <plugins>
-            <plugin>
-                <groupId>org.springframework.boot</groupId>
-                <artifactId>spring-boot-maven-plugin</artifactId>
-            </plugin>
-            <plugin>
-                <groupId>org.xolstice.maven.plugins</groupId>
-                <artifactId>protobuf-maven-plugin</artifactId>
-                <version>{PROTOBUF_MAVEN_PLUGIN_VERSION}</version>
-                <configuration>
-                    <protocArtifact>com.google.protobuf:protoc:{PROTOBUF_VERSION}:exe:${{os.detected.classifier}}</protocArtifact>
-                    <pluginId>grpc-java</pluginId>
-                    <pluginArtifact>io.grpc:protoc-gen-grpc-java:{GRPC_VERSION}:exe:${{os.detected.classifier}}</pluginArtifact>
-                    <protoSourceRoot>src/main/proto</protoSourceRoot>
-                </configuration>
-                <executions>
-                    <execution>
-                        <goals>
-                            <goal>compile</goal>
-                            <goal>compile-custom</goal>
-                        </goals>
-                    </execution>
-                </executions>
-            </plugin>
-            <plugin>
+"""
+_POM_COMPILER_PLUGIN = f"""            <plugin>
                 <groupId>org.apache.maven.plugins</groupId>
                 <artifactId>maven-compiler-plugin</artifactId>
                 <version>{MAVEN_COMPILER_PLUGIN_VERSION}</version>
@@ -747,12 +460,24 @@ EXPECTED_FULL_EXAMPLE_POM_SERVER = f"""<?xml version='1.0' encoding='utf-8'?>
                     </annotationProcessorPaths>
                 </configuration>
             </plugin>
-        </plugins>
-    </build>
-</project>
 """
 
 
+def _build_expected_pom(*, server: bool) -> str:
+    """Assemble the expected POM output of the handler in client or server mode."""
+    if not server:
+        return "".join((_EXPECTED_POM_HEAD, _EXPECTED_POM_BUILD, _EXPECTED_POM_TAIL))
+    return "".join((_EXPECTED_POM_HEAD, _POM_SERVER_DEPENDENCIES, _EXPECTED_POM_BUILD, _POM_COMPILER_PLUGIN,
+                    _EXPECTED_POM_TAIL))
+
 
+EXPECTED_FULL_EXAMPLE_POM = _build_expected_pom(server=False)
+EXPECTED_FULL_EXAMPLE_POM_SERVER = _build_expected_pom(server=True)
 
 
+# normalized expected outputs (computed once for the whole test session)
+_EXPECTED_FULL_EXAMPLE_GRADLE_NORM = _normalize(EXPECTED_FULL_EXAMPLE_GRADLE)
+_EXPECTED_FULL_EXAMPLE_GRADLE_SERVER_NORM = _normalize(EXPECTED_FULL_EXAMPLE_GRADLE_SERVER)
+_EXPECTED_FULL_EXAMPLE_GRADLE_SERVER_WITHOUT_CAFFEINE_NORM = _normalize(EXPECTED_FULL_EXAMPLE_GRADLE_SERVER_WITHOUT_CAFFEINE)
+_EXPECTED_FULL_EXAMPLE_POM_NORM = _normalize(EXPECTED_FULL_EXAMPLE_POM)
+_EXPECTED_FULL_EXAMPLE_POM_SERVER_NORM = _normalize(EXPECTED_FULL_EXAMPLE_POM_SERVER.replace("{java_version}", "11"))
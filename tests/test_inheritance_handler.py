@@ -1,6 +1,11 @@
 import unittest
 import os
-import json
+import itertools
+
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
 
 from monomorph.analysis.json import JsonModel
 from monomorph.models import UpdatedDecomposition
@@ -9,32 +14,35 @@ from monomorph.planning.inheritance import InheritanceHandler
 
 class TestInheritanceHandler(unittest.TestCase):
     TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+    APP_NAME = "example-project-2"
 
-    def _prepare_for_test(self):
-        # define the app name
-        app_name = "example-project-2"
-        analysis_data_path = os.path.join(self.TEST_DIR, "data", "analysis", app_name)
-        decomposition_file = os.path.join(self.TEST_DIR, "data", "decompositions", app_name, "manual",
+    @classmethod
+    def setUpClass(cls):
+        # define the paths of the test application
+        analysis_data_path = os.path.join(cls.TEST_DIR, "data", "analysis", cls.APP_NAME)
+        decomposition_file = os.path.join(cls.TEST_DIR, "data", "decompositions", cls.APP_NAME, "manual",
                                           "decompositions.json")
-        # load the data
-        with open(decomposition_file, "r") as f:
-            decomposition_dict = json.load(f)[0]
-        with open(os.path.join(analysis_data_path, "typeData.json"), "r") as f:
-            type_data = json.load(f)
-        with open(os.path.join(analysis_data_path, "methodData.json"), "r") as f:
-            method_data = json.load(f)
-        # preprocess the data
-        type_data["classes"] = [{k: v for k, v in value.items() if k not in ["span"]} for value in type_data["classes"]]
-        method_data["methods"] = [{k: v for k, v in value.items() if k not in ["span"]} for value in method_data["methods"]]
+        # load the data once for all the tests (orjson is used for decoding if it is available)
+        with open(decomposition_file, "rb") as f:
+            cls._decomposition_dict = _json.loads(f.read())[0]
+        with open(os.path.join(analysis_data_path, "typeData.json"), "rb") as f:
+            type_data = _json.loads(f.read())
+        with open(os.path.join(analysis_data_path, "methodData.json"), "rb") as f:
+            method_data = _json.loads(f.read())
+        # preprocess the data (the spans are removed in place instead of rebuilding the dicts)
+        for value in type_data["classes"]:
+            value.pop("span", None)
         for method in method_data["methods"]:
-            for key in ["localInvocations", "invocations"]:
-                for invocation in method[key]:
-                    if "span" in invocation:
-                        invocation.pop("span")
-        # initialize the classes
-        model = JsonModel(app_name, type_data, method_data)
-        decomposition = UpdatedDecomposition.from_monoembed(decomposition_dict, app_name)
-        return decomposition, model
+            method.pop("span", None)
+            for invocation in itertools.chain(method["localInvocations"], method["invocations"]):
+                invocation.pop("span", None)
+        # the model is only read by the handler, so it is shared by all the tests
+        cls._model = JsonModel(cls.APP_NAME, type_data, method_data)
+
+    def _prepare_for_test(self):
+        # the handler updates the decomposition, so each test gets its own (building it is cheaper than a deep copy)
+        decomposition = UpdatedDecomposition.from_monoembed(self._decomposition_dict, self.APP_NAME)
+        return decomposition, self._model
 
     def test_update_decomposition(self):
         decomposition, model = self._prepare_for_test()
@@ -49,16 +57,8 @@ class TestInheritanceHandler(unittest.TestCase):
             "cluster_5": {("com.example.library.services.ExtendedBasicService", "cluster_3"),
                           ("com.example.library.services.BasicService", "cluster_2")}
         }
-        # verify the output
+        # verify the output (assertSetEqual reports both the missing and the extra duplicated classes)
         for partition in decomposition_out.partitions:
-            if partition.name not in expected_duplicated_classes:
-                self.assertEqual(len(partition.duplicated_classes), 0,
-                                 f"The partition {partition.name} should not have the duplicated classes: "
-                                 f"{partition.duplicated_classes}")
-            else:
-                missing_classes = expected_duplicated_classes[partition.name] - set(partition.duplicated_classes)
-                self.assertEqual(len(missing_classes), 0,
-                                 f"The partition {partition.name} is missing the duplicated classes: {missing_classes}")
-                extra_classes = set(partition.duplicated_classes) - expected_duplicated_classes[partition.name]
-                self.assertEqual(len(extra_classes), 0,
-                                 f"The partition {partition.name} has extra duplicated classes: {extra_classes}")
\ No newline at end of file
+            self.assertSetEqual(set(partition.duplicated_classes),
+                                expected_duplicated_classes.get(partition.name, set()),
+                                f"The duplicated classes of the partition {partition.name} are not as expected")
@@ -0,0 +1,60 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from monomorph.llm import factory
+
+
+def read_file(path: str) -> str:
+    """Read a file."""
+    return path
+
+
+def write_file(path: str, content: str) -> str:
+    """Write a file."""
+    return path
+
+
+class TestInitSharedModel(unittest.TestCase):
+
+    def setUp(self):
+        init_model_patch = patch.object(factory, "init_model", side_effect=lambda *args, **kwargs: object())
+        self.init_model = init_model_patch.start()
+        self.addCleanup(init_model_patch.stop)
+        shared_models_patch = patch.object(factory, "_SHARED_MODELS", factory.OrderedDict())
+        shared_models_patch.start()
+        self.addCleanup(shared_models_patch.stop)
+
+    def test_same_configuration_reuses_the_model(self):
+        """The same configuration returns the same model instance, even when requested concurrently."""
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            models = list(executor.map(lambda _: factory.init_shared_model("model", tools=[read_file, write_file]),
+                                       range(16)))
+        self.assertEqual(len({id(model) for model in models}), 1)
+        self.assertEqual(self.init_model.call_count, 1)
+        # The order of the tools does not matter
+        self.assertIs(factory.init_shared_model("model", tools=[write_file, read_file]), models[0])
+
+    def test_different_tools_get_different_models(self):
+        """Different tool sets are bound to different model instances."""
+        model_read = factory.init_shared_model("model", tools=[read_file])
+        model_write = factory.init_shared_model("model", tools=[write_file])
+        self.assertIsNot(model_read, model_write)
+        self.assertEqual(self.init_model.call_count, 2)
+
+    def test_least_recently_used_models_are_evicted(self):
+        """The cache keeps at most _MAX_SHARED_MODELS models and evicts the least recently used one."""
+        first_model = factory.init_shared_model("model-0")
+        for i in range(1, factory._MAX_SHARED_MODELS):
+            factory.init_shared_model(f"model-{i}")
+        # Using the first model again makes model-1 the least recently used one
+        self.assertIs(factory.init_shared_model("model-0"), first_model)
+        factory.init_shared_model("new-model")
+        self.assertEqual(len(factory._SHARED_MODELS), factory._MAX_SHARED_MODELS)
+        self.assertIs(factory.init_shared_model("model-0"), first_model)
+        factory.init_shared_model("model-1")
+        self.assertEqual(self.init_model.call_count, factory._MAX_SHARED_MODELS + 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
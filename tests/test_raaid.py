@@ -0,0 +1,58 @@
+import unittest
+from unittest.mock import MagicMock
+
+from monomorph.validation.raaid import get_all_project_files_docker, fuzzy_find_project_files, DEFAULT_EXCLUDE_PATTERNS
+
+
+class TestGetAllProjectFilesDocker(unittest.TestCase):
+
+    def setUp(self):
+        self.ms_docker = MagicMock()
+        self.ms_docker.list_files.return_value = (True, [
+            "/app/Makefile",
+            "/app/pom.xml",
+            "/app/build.gradle",
+            "/app/src/Main.java",
+        ], None)
+
+    def test_only_equivalent_patterns_are_pushed_to_find(self):
+        """Only the patterns that `find -name` applies like fnmatch on absolute paths are filtered in the container."""
+        exclude_patterns = DEFAULT_EXCLUDE_PATTERNS + ["Makefile", "build*", "pom.xml", "*.j?va", "*/tmp", "*.class"]
+        get_all_project_files_docker(self.ms_docker, ".", exclude_patterns=exclude_patterns)
+        self.assertListEqual(self.ms_docker.list_files.call_args.kwargs["exclude_names"],
+                             ["*.pyc", "*.so", "*.o", "*.class"])
+
+    def test_file_name_patterns_do_not_match_absolute_paths(self):
+        """Patterns without a leading '*' are matched against the absolute path, so they keep the files."""
+        files = get_all_project_files_docker(self.ms_docker, ".", exclude_patterns=["Makefile", "build*", "pom.xml"])
+        self.assertListEqual(files, ["/app/Makefile", "/app/build.gradle", "/app/pom.xml", "/app/src/Main.java"])
+
+    def test_python_filter_applies_remaining_patterns(self):
+        """Patterns left out of `find` are still applied by the Python filter."""
+        files = get_all_project_files_docker(self.ms_docker, ".", exclude_patterns=["*/src/*", "*.gradle"])
+        self.assertListEqual(files, ["/app/Makefile", "/app/pom.xml"])
+
+
+class TestFuzzyFindProjectFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.ms_docker = MagicMock()
+        self.ms_docker.list_files.return_value = (True, [
+            "/app/src/main/java/com/example/OrderService.java",
+            "/app/src/main/java/com/example/OrderController.java",
+            "/app/src/main/java/com/example/Customer.java",
+            "/app/docs/User Guide.md",
+        ], None)
+
+    def test_substring_matches_score_100(self):
+        """Paths containing the search term are returned first with a score of 100."""
+        matches = fuzzy_find_project_files(self.ms_docker, "orderservice", max_results=1)
+        self.assertListEqual(matches, [("/app/src/main/java/com/example/OrderService.java", 100)])
+
+    def test_blank_search_term_skips_substring_matches(self):
+        """A blank search term is not used as a substring, so paths containing whitespace do not score 100."""
+        self.assertListEqual(fuzzy_find_project_files(self.ms_docker, " "), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
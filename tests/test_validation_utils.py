@@ -0,0 +1,93 @@
+import unittest
+import logging
+from datetime import datetime
+
+from monomorph.validation.utils import parse_find_details, build_tree_structure, render_tree
+
+
+class TestParseFindDetails(unittest.TestCase):
+
+    def setUp(self):
+        # Suppress the warnings of the malformed lines
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_parse_line(self):
+        """Test that the fields of a find -printf line are parsed."""
+        details = parse_find_details(["/app/pom.xml|1024|1700000000.5|644|f"])
+        self.assertDictEqual(details["/app/pom.xml"], {
+            'type': 'f',
+            'size': 1024,
+            'mtime': datetime.fromtimestamp(1700000000.5).strftime('%Y-%m-%d %H:%M:%S'),
+            'mtime_epoch': 1700000000.5,
+            'permissions': '644',
+            'is_file': True
+        })
+
+    def test_same_second_mtimes(self):
+        """Test that the modification times within the same second get the same readable time."""
+        details = parse_find_details(["/app/a|1|1700000000.1|644|f", "/app/b|1|1700000000.9|644|f"])
+        self.assertEqual(details["/app/a"]["mtime"], details["/app/b"]["mtime"])
+        self.assertEqual(details["/app/b"]["mtime_epoch"], 1700000000.9)
+
+    def test_line_with_missing_fields_is_skipped(self):
+        """Test that a line with less than 5 fields is skipped."""
+        self.assertDictEqual(parse_find_details(["/app/pom.xml|1024|1700000000.5|644"]), {})
+
+    def test_line_with_extra_fields_uses_the_first_five(self):
+        """Test that the fields after the fifth separator are ignored."""
+        details = parse_find_details(["/app/a|b|1024|1700000000.5|644|f"])
+        self.assertListEqual(list(details), ["/app/a"])
+        self.assertEqual(details["/app/a"]["type"], "644")
+        self.assertEqual(details["/app/a"]["size"], 0)
+
+    def test_invalid_numbers(self):
+        """Test that non numeric sizes and modification times fall back to default values."""
+        details = parse_find_details(["/app/a|-1|abc|644|d"])["/app/a"]
+        self.assertEqual(details["size"], 0)
+        self.assertEqual(details["mtime"], "unknown")
+        self.assertEqual(details["mtime_epoch"], 0)
+        self.assertFalse(details["is_file"])
+
+
+
+class TestTreeStructure(unittest.TestCase):
+
+    @staticmethod
+    def _file_info(is_file: bool = True) -> dict:
+        return {'type': 'f' if is_file else 'd', 'size': 0, 'mtime': 'unknown', 'is_file': is_file}
+
+    def test_render_tree(self):
+        """Test that the files are rendered below their directories."""
+        files_data = {
+            "/app": self._file_info(is_file=False),
+            "/app/src": self._file_info(is_file=False),
+            "/app/src/Main.java": {**self._file_info(), 'is_changed': True},
+            "/app/pom.xml": {**self._file_info(), 'can_modify': False},
+        }
+        tree = build_tree_structure(files_data, "/app")
+        self.assertListEqual(list(render_tree(tree)), [
+            "├── src/",
+            "│   └── Main.java  [WRITABLE, CHANGED]",
+            "└── pom.xml  [READ-ONLY, UNCHANGED]",
+        ])
+
+    def test_reserved_file_names(self):
+        """Test that files named like the node details are rendered as regular files."""
+        files_data = {
+            "/app/__info__": self._file_info(),
+            "/app/__path__": self._file_info(is_file=False),
+            "/app/__path__/_info": self._file_info(),
+        }
+        tree = build_tree_structure(files_data, "/app")
+        self.assertListEqual(list(render_tree(tree, include_can_modif=False, include_changed=False)), [
+            "├── __info__ ",
+            "└── __path__/",
+            "    └── _info ",
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()